@@ -1,3 +1,4 @@
+import asyncio
 import json
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -6,16 +7,28 @@ from urllib.parse import urlencode
 from fastapi import APIRouter, Request
 from fastapi.responses import HTMLResponse, PlainTextResponse
 from fastapi.templating import Jinja2Templates
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
 from prometheus_client import CONTENT_TYPE_LATEST, Gauge, generate_latest
 
 from src.config import settings
 from src.database import db
 from src.jellyfin_client import jellyfin_client
+from src.models import DeviceStats, HourlyStats
 
 router = APIRouter()
 
 templates_dir = Path(__file__).parent / "templates"
-templates = Jinja2Templates(directory=templates_dir)
+# Templates ship with the package, so skip the per-render mtime check and keep
+# compiled bytecode on disk across restarts
+templates = Jinja2Templates(
+    env=Environment(
+        loader=FileSystemLoader(templates_dir),
+        autoescape=select_autoescape(),
+        auto_reload=False,
+        cache_size=400,
+        bytecode_cache=FileSystemBytecodeCache(),
+    )
+)
 
 ACTIVE_SESSIONS = Gauge("jellytrack_active_sessions", "Active playback sessions")
 TOTAL_SESSIONS = Gauge("jellytrack_total_sessions", "Total sessions tracked")
@@ -25,6 +38,11 @@ LAST_WS_MESSAGE = Gauge(
 )
 
 
+async def _none() -> None:
+    """Placeholder awaitable for an optional slot in asyncio.gather."""
+    return None
+
+
 def format_duration(seconds: int) -> str:
     """Format seconds as human readable duration."""
     if not seconds:
@@ -271,86 +289,47 @@ async def index(request: Request, days: int = 30):
     device_name = _normalize_filter(request.query_params.get("device_name"))
     media_type = _normalize_filter(request.query_params.get("media_type"))
 
-    sessions = await db.get_active_sessions(
-        user_id=user_id, device_name=device_name, media_type=media_type
-    )
-    watchtime = await db.get_user_watchtime(
-        days=query_days,
-        user_id=user_id,
-        device_name=device_name,
-        media_type=media_type,
-    )
-    top_media = await db.get_top_media(
-        days=query_days,
-        user_id=user_id,
-        device_name=device_name,
-        media_type=media_type,
-    )
-    hourly = await db.get_hourly_stats(
-        days=query_days,
-        user_id=user_id,
-        device_name=device_name,
-        media_type=media_type,
-    )
-    devices = await db.get_device_stats(
-        days=query_days,
-        user_id=user_id,
-        device_name=device_name,
-        media_type=media_type,
-    )
-    summary = await db.get_summary_stats(
-        days=query_days,
-        user_id=user_id,
-        device_name=device_name,
-        media_type=media_type,
-    )
-    media_types = await db.get_media_type_stats(
-        days=query_days,
-        user_id=user_id,
-        device_name=device_name,
-        media_type=media_type,
-    )
-    recent = await db.get_recent_activity(
-        limit=15,
-        user_id=user_id,
-        device_name=device_name,
-        media_type=media_type,
-    )
-    daily = await db.get_daily_stats(
-        days=min(query_days, 90),
-        user_id=user_id,
-        device_name=device_name,
-        media_type=media_type,
-    )
-    heatmap = await db.get_hourly_weekday_heatmap(
-        days=query_days,
-        user_id=user_id,
-        device_name=device_name,
-        media_type=media_type,
-    )
-    series_days = min(query_days, 90)
-    series_daily = await db.get_series_daily_totals(
-        days=series_days,
-        user_id=user_id,
-        device_name=device_name,
-        media_type=media_type,
-    )
     metrics_days = (
         query_days if settings.retention_days <= 0 else min(query_days, settings.retention_days)
     )
-    sessions_for_metrics = await db.get_sessions_for_metrics(
-        days=metrics_days,
-        user_id=user_id,
-        device_name=device_name,
-        media_type=media_type,
-    )
-    pause_stats = await db.get_pause_stats(
-        days=query_days,
-        user_id=user_id,
-        device_name=device_name,
-        media_type=media_type,
+    series_days = min(query_days, 90)
+    filter_kwargs = {"user_id": user_id, "device_name": device_name, "media_type": media_type}
+
+    # Independent reads: run them together so the read pool can serve them in parallel
+    (
+        sessions,
+        watchtime,
+        top_media,
+        hourly,
+        devices,
+        summary,
+        media_types,
+        recent,
+        daily,
+        heatmap,
+        series_daily,
+        sessions_for_metrics,
+        pause_stats,
+        filters,
+        previous_total,
+    ) = await asyncio.gather(
+        db.get_active_sessions_light(**filter_kwargs),
+        db.get_user_watchtime(days=query_days, **filter_kwargs),
+        db.get_top_media(days=query_days, **filter_kwargs),
+        db.get_hourly_stats(days=query_days, **filter_kwargs),
+        db.get_device_stats(days=query_days, **filter_kwargs),
+        db.get_summary_stats(days=query_days, **filter_kwargs),
+        db.get_media_type_stats(days=query_days, **filter_kwargs),
+        db.get_recent_activity(limit=15, **filter_kwargs),
+        db.get_daily_stats(days=min(query_days, 90), **filter_kwargs),
+        db.get_hourly_weekday_heatmap(days=query_days, **filter_kwargs),
+        db.get_series_daily_totals(days=series_days, **filter_kwargs),
+        db.get_sessions_for_metrics(days=metrics_days, **filter_kwargs),
+        db.get_pause_stats(days=query_days, **filter_kwargs),
+        db.get_filter_options(days=query_days),
+        # Trend baseline covers the previous period too; all-time has no trend
+        db.get_summary_stats(days=query_days * 2, **filter_kwargs) if days > 0 else _none(),
     )
-    filters = await db.get_filter_options(days=query_days)
 
     # Prepare chart data
     hourly_data = [0] * 24
@@ -401,14 +380,8 @@ async def index(request: Request, days: int = 30):
     filter_query = urlencode(filter_params)
 
     trend = None
-    if days > 0:
+    if previous_total is not None:
         current = summary
-        previous_total = await db.get_summary_stats(
-            days=query_days * 2,
-            user_id=user_id,
-            device_name=device_name,
-            media_type=media_type,
-        )
         prev_sessions = max(0, previous_total["total_sessions"] - current["total_sessions"])
         prev_seconds = max(0, previous_total["total_seconds"] - current["total_seconds"])
         trend = {
@@ -488,7 +461,7 @@ async def active_sessions(request: Request):
     user_id = _normalize_filter(request.query_params.get("user_id"))
     device_name = _normalize_filter(request.query_params.get("device_name"))
     media_type = _normalize_filter(request.query_params.get("media_type"))
-    sessions = await db.get_active_sessions(
+    sessions = await db.get_active_sessions_light(
         user_id=user_id, device_name=device_name, media_type=media_type
     )
     return templates.TemplateResponse(
@@ -546,7 +519,7 @@ async def recent_activity(request: Request):
     )
 
 
-@router.get("/api/stats/hourly")
+@router.get("/api/stats/hourly", response_model=list[HourlyStats])
 async def hourly_stats(request: Request, days: int = 30):
     """Get hourly usage stats as JSON for charts."""
     user_id = _normalize_filter(request.query_params.get("user_id"))
@@ -555,10 +528,10 @@ async def hourly_stats(request: Request, days: int = 30):
     hourly = await db.get_hourly_stats(
         days=days, user_id=user_id, device_name=device_name, media_type=media_type
     )
-    return [h.model_dump() for h in hourly]
+    return hourly
 
 
-@router.get("/api/stats/devices")
+@router.get("/api/stats/devices", response_model=list[DeviceStats])
 async def device_stats(request: Request, days: int = 30):
     """Get device stats as JSON."""
     user_id = _normalize_filter(request.query_params.get("user_id"))
@@ -567,7 +540,7 @@ async def device_stats(request: Request, days: int = 30):
     devices = await db.get_device_stats(
         days=days, user_id=user_id, device_name=device_name, media_type=media_type
     )
-    return [d.model_dump() for d in devices]
+    return devices
 
 
 @router.get("/health")
@@ -590,7 +563,7 @@ async def health():
 @router.get("/metrics")
 async def metrics():
     """Prometheus metrics endpoint."""
-    active = await db.get_active_sessions()
+    active = await db.get_active_sessions_light()
     summary = await db.get_summary_stats(days=36500)
     status = jellyfin_client.status()
 
@@ -12,6 +12,9 @@ class Settings(BaseSettings):
     retention_days: int = 180
     aggregation_interval_hours: int = 24
     excluded_user_names: str = "admin"
+    use_uvloop: bool = True
+    db_read_pool_size: int = 4
+    flush_interval_seconds: int = 15
 
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
 
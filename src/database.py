@@ -1,7 +1,11 @@
+import asyncio
+import json
 import logging
+import sqlite3
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional
+from typing import AsyncIterator, Optional
 
 import aiosqlite
 
@@ -10,32 +14,238 @@ from .models import DeviceStats, HourlyStats, Session, TopMedia, UserWatchtime
 
 logger = logging.getLogger(__name__)
 
+# NORMAL is durable under WAL except on power loss; temp B-trees stay in memory,
+# the page cache is ~64MB, and lock contention waits up to 5s instead of failing
+_CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA busy_timeout=5000",
+)
+
+_INSERT_SESSION_SQL = """
+    INSERT INTO sessions (session_id, jellyfin_session_id, user_id, user_name, device_id,
+                          device_name, client_name, media_id, media_title, media_type,
+                          series_name,
+                          season_number, episode_number, started_at, ended_at,
+                          play_duration_seconds, paused_duration_seconds, is_active,
+                          last_position_seconds, last_state_is_paused, last_progress_update)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_INSERT_NEW_SESSION_SQL = _INSERT_SESSION_SQL + "    ON CONFLICT(session_id) DO NOTHING\n"
+
+_UPSERT_SESSION_SQL = (
+    _INSERT_SESSION_SQL
+    + """    ON CONFLICT(session_id) DO UPDATE SET
+        jellyfin_session_id = excluded.jellyfin_session_id,
+        user_id = excluded.user_id,
+        user_name = excluded.user_name,
+        device_id = excluded.device_id,
+        device_name = excluded.device_name,
+        client_name = excluded.client_name,
+        media_id = excluded.media_id,
+        media_title = excluded.media_title,
+        media_type = excluded.media_type,
+        series_name = excluded.series_name,
+        season_number = excluded.season_number,
+        episode_number = excluded.episode_number,
+        started_at = excluded.started_at,
+        ended_at = excluded.ended_at,
+        play_duration_seconds = excluded.play_duration_seconds,
+        paused_duration_seconds = excluded.paused_duration_seconds,
+        is_active = excluded.is_active,
+        last_position_seconds = excluded.last_position_seconds,
+        last_state_is_paused = excluded.last_state_is_paused,
+        last_progress_update = excluded.last_progress_update
+"""
+)
+
+_UPDATE_SESSION_STATE_SQL = """
+    UPDATE sessions
+    SET last_progress_update = ?,
+        play_duration_seconds = play_duration_seconds + ?,
+        paused_duration_seconds = paused_duration_seconds + ?,
+        last_position_seconds = ?,
+        last_state_is_paused = ?
+    WHERE session_id = ? AND is_active = 1
+"""
+
+_END_SESSION_SQL = """
+    UPDATE sessions
+    SET ended_at = ?, is_active = 0
+    WHERE session_id = ? AND is_active = 1
+"""
+
+_AGGREGATE_SESSIONS_SQL = """
+    INSERT INTO session_aggregates (
+        date, hour, user_id, user_name, media_id, media_title, media_type,
+        series_name, device_name, client_name, session_count, play_seconds,
+        paused_seconds
+    )
+    SELECT
+        date(started_at) as date,
+        CAST(strftime('%H', started_at) AS INTEGER) as hour,
+        user_id,
+        MAX(user_name) as user_name,
+        media_id,
+        MAX(media_title) as media_title,
+        MAX(media_type) as media_type,
+        MAX(series_name) as series_name,
+        device_name,
+        client_name,
+        COUNT(*) as session_count,
+        SUM(play_duration_seconds) as play_seconds,
+        SUM(paused_duration_seconds) as paused_seconds
+    FROM sessions
+    WHERE id IN (SELECT value FROM json_each(?))
+    GROUP BY date, hour, user_id, media_id, device_name, client_name
+    ON CONFLICT(date, hour, user_id, media_id, device_name, client_name)
+    DO UPDATE SET
+        session_count = session_count + excluded.session_count,
+        play_seconds = play_seconds + excluded.play_seconds,
+        paused_seconds = paused_seconds + excluded.paused_seconds,
+        user_name = excluded.user_name,
+        media_title = excluded.media_title,
+        media_type = excluded.media_type,
+        series_name = excluded.series_name
+"""
+
+_PRUNE_SESSIONS_SQL = """
+    DELETE FROM sessions
+    WHERE id IN (SELECT value FROM json_each(?))
+"""
+
+_PRUNE_BATCH_IDS_SQL = """
+    SELECT id FROM sessions
+    WHERE started_at < ? AND is_active = 0
+    LIMIT ?
+"""
+
+# Sessions aggregated and deleted per write transaction while pruning
+_PRUNE_BATCH_SIZE = 5000
+
+# (session_id, position_seconds, is_paused, play_add_seconds, paused_add_seconds, now)
+SessionStateUpdate = tuple[str, int, bool, int, int, datetime]
+
+
+def _session_params(session: Session) -> tuple:
+    """Bind parameters for _INSERT_SESSION_SQL and its variants."""
+    return (
+        session.session_id,
+        session.jellyfin_session_id,
+        session.user_id,
+        session.user_name,
+        session.device_id,
+        session.device_name,
+        session.client_name,
+        session.media_id,
+        session.media_title,
+        session.media_type,
+        session.series_name,
+        session.season_number,
+        session.episode_number,
+        session.started_at.isoformat(),
+        session.ended_at.isoformat() if session.ended_at else None,
+        session.play_duration_seconds,
+        session.paused_duration_seconds,
+        int(session.is_active),
+        session.last_position_seconds,
+        session.last_state_is_paused,
+        session.last_progress_update.isoformat(),
+    )
+
+
+def _session_state_params(update: SessionStateUpdate) -> tuple:
+    """Bind parameters for _UPDATE_SESSION_STATE_SQL."""
+    session_id, position_seconds, is_paused, play_add_seconds, paused_add_seconds, now = update
+    return (
+        now.isoformat(),
+        play_add_seconds,
+        paused_add_seconds,
+        position_seconds,
+        is_paused,
+        session_id,
+    )
+
 
 class Database:
-    def __init__(self, db_path: Optional[Path] = None):
+    def __init__(self, db_path: Optional[Path] = None, read_pool_size: Optional[int] = None):
         self.db_path = db_path or settings.database_path_resolved
+        self.read_pool_size = (
+            settings.db_read_pool_size if read_pool_size is None else read_pool_size
+        )
         self._connection: Optional[aiosqlite.Connection] = None
+        self._readers: list[aiosqlite.Connection] = []
+        self._read_pool: Optional[asyncio.Queue[aiosqlite.Connection]] = None
 
     async def connect(self) -> None:
         """Connect to the database and create tables if needed."""
         self._connection = await aiosqlite.connect(self.db_path)
         self._connection.row_factory = aiosqlite.Row
+        # WAL lets the read-only connections run alongside the writer
+        await self._connection.execute("PRAGMA journal_mode=WAL")
+        await self._apply_pragmas(self._connection)
         await self._create_tables()
         await self._ensure_columns()
         await self._create_aggregate_tables()
+        await self.optimize()
+        await self._open_readers()
+
+    async def _apply_pragmas(self, conn: aiosqlite.Connection) -> None:
+        """Apply the per-connection tuning PRAGMAs."""
+        for pragma in _CONNECTION_PRAGMAS:
+            await conn.execute(pragma)
+
+    async def _open_readers(self) -> None:
+        """Open the read-only connections used for queries."""
+        uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+        self._read_pool = asyncio.Queue()
+        for _ in range(self.read_pool_size):
+            reader = await aiosqlite.connect(uri, uri=True)
+            reader.row_factory = aiosqlite.Row
+            await self._apply_pragmas(reader)
+            self._readers.append(reader)
+            self._read_pool.put_nowait(reader)
 
     async def close(self) -> None:
         """Close the database connection."""
+        # Each connection runs on its own thread, so the readers close in parallel;
+        # the writer goes last so it is the one to checkpoint the WAL
+        await asyncio.gather(*(reader.close() for reader in self._readers))
+        self._readers = []
+        self._read_pool = None
         if self._connection:
             await self._connection.close()
             self._connection = None
 
+    async def optimize(self) -> None:
+        """Refresh planner statistics so SQLite picks the right indexes."""
+        # PRAGMA optimize only re-analyzes tables this connection has queried, and all
+        # SELECTs run on the read-only pool, so it would never fire here. A sampled
+        # ANALYZE reads ~400 rows per index, which costs about the same at any size.
+        await self.conn.execute("PRAGMA analysis_limit=400")
+        await self.conn.execute("ANALYZE")
+        await self.conn.commit()
+
     @property
     def conn(self) -> aiosqlite.Connection:
         if not self._connection:
             raise RuntimeError("Database not connected")
         return self._connection
 
+    @asynccontextmanager
+    async def read(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Borrow a pooled read-only connection (the writer if no pool is open)."""
+        if not self._readers:
+            yield self.conn
+            return
+        reader = await self._read_pool.get()
+        try:
+            yield reader
+        finally:
+            self._read_pool.put_nowait(reader)
+
     def _include_aggregates(self, days: int) -> bool:
         return days > settings.retention_days
 
@@ -44,10 +254,13 @@ class Database:
         user_id: Optional[str],
         device_name: Optional[str],
         media_type: Optional[str],
+        exclude_users: bool = True,
     ) -> tuple[str, list[str]]:
         clauses = []
         params: list[str] = []
-        exclusion_clause, exclusion_params = self._build_exclusion_clause()
+        exclusion_clause, exclusion_params = (
+            self._build_exclusion_clause() if exclude_users else ("", [])
+        )
         if exclusion_clause:
             clauses.append(exclusion_clause)
             params.extend(exclusion_params)
@@ -93,18 +306,23 @@ class Database:
                 ended_at TIMESTAMP,
                 play_duration_seconds INTEGER DEFAULT 0,
                 paused_duration_seconds INTEGER DEFAULT 0,
-                is_active BOOLEAN DEFAULT TRUE,
+                is_active INTEGER NOT NULL DEFAULT 1,
                 last_position_seconds INTEGER DEFAULT 0,
                 last_state_is_paused BOOLEAN DEFAULT FALSE,
-                last_progress_update TIMESTAMP
+                last_progress_update TIMESTAMP,
+                hour_of_day INTEGER GENERATED ALWAYS AS (
+                    CAST(strftime('%H', started_at) AS INTEGER)
+                ) STORED
             )
         """)
         await self.conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_user ON sessions(user_id)")
+        # Partial index: only active rows are indexed, ordered by started_at, so the
+        # active-session queries both filter and sort from this tiny index
+        await self.conn.execute("DROP INDEX IF EXISTS idx_sessions_active")
+        await self.conn.execute("DROP INDEX IF EXISTS idx_sessions_active_only")
         await self.conn.execute(
-            "CREATE INDEX IF NOT EXISTS idx_sessions_active ON sessions(is_active)"
-        )
-        await self.conn.execute(
-            "CREATE INDEX IF NOT EXISTS idx_sessions_started ON sessions(started_at)"
+            "CREATE INDEX IF NOT EXISTS idx_sessions_active_started ON sessions(started_at) "
+            "WHERE is_active = 1"
         )
         await self.conn.execute(
             "CREATE INDEX IF NOT EXISTS idx_sessions_jellyfin ON sessions(jellyfin_session_id)"
@@ -113,7 +331,8 @@ class Database:
 
     async def _ensure_columns(self) -> None:
         """Add missing columns for backwards-compatible upgrades."""
-        cursor = await self.conn.execute("PRAGMA table_info(sessions)")
+        # table_xinfo (unlike table_info) also lists generated columns
+        cursor = await self.conn.execute("PRAGMA table_xinfo(sessions)")
         rows = await cursor.fetchall()
         existing = {row["name"] for row in rows}
         missing = {
@@ -121,6 +340,10 @@ class Database:
             "paused_duration_seconds": "INTEGER DEFAULT 0",
             "last_position_seconds": "INTEGER DEFAULT 0",
             "last_state_is_paused": "BOOLEAN DEFAULT FALSE",
+            # ALTER TABLE cannot add STORED generated columns, VIRTUAL is indexable too
+            "hour_of_day": (
+                "INTEGER GENERATED ALWAYS AS (CAST(strftime('%H', started_at) AS INTEGER)) VIRTUAL"
+            ),
         }
         added = False
         added_jellyfin = False
@@ -138,6 +361,21 @@ class Database:
                 "WHERE jellyfin_session_id IS NULL"
             )
             await self.conn.commit()
+        await self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_sessions_hour ON sessions(hour_of_day, started_at)"
+        )
+        # Covering index for the stats queries: the started_at range comes first, then
+        # the filter (including the user_name exclusion), group-by and summed columns
+        # so they never touch the table rows. Created here because older databases
+        # only gain paused_duration_seconds above.
+        await self.conn.execute("DROP INDEX IF EXISTS idx_sessions_started")
+        await self.conn.execute("DROP INDEX IF EXISTS idx_sessions_started_stats")
+        await self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_sessions_stats ON sessions("
+            "started_at, user_id, user_name, device_name, client_name, media_type, "
+            "series_name, play_duration_seconds, paused_duration_seconds)"
+        )
+        await self.conn.commit()
 
     async def _create_aggregate_tables(self) -> None:
         """Create aggregation tables if they don't exist."""
@@ -175,98 +413,68 @@ class Database:
 
     async def create_session(self, session: Session) -> int:
         """Create or update a playback session (UPSERT)."""
-        cursor = await self.conn.execute(
-            """
-            INSERT INTO sessions (session_id, jellyfin_session_id, user_id, user_name, device_id,
-                                  device_name, client_name, media_id, media_title, media_type,
-                                  series_name,
-                                  season_number, episode_number, started_at, ended_at,
-                                  play_duration_seconds, paused_duration_seconds, is_active,
-                                  last_position_seconds, last_state_is_paused, last_progress_update)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ON CONFLICT(session_id) DO UPDATE SET
-                jellyfin_session_id = excluded.jellyfin_session_id,
-                user_id = excluded.user_id,
-                user_name = excluded.user_name,
-                device_id = excluded.device_id,
-                device_name = excluded.device_name,
-                client_name = excluded.client_name,
-                media_id = excluded.media_id,
-                media_title = excluded.media_title,
-                media_type = excluded.media_type,
-                series_name = excluded.series_name,
-                season_number = excluded.season_number,
-                episode_number = excluded.episode_number,
-                started_at = excluded.started_at,
-                ended_at = excluded.ended_at,
-                play_duration_seconds = excluded.play_duration_seconds,
-                paused_duration_seconds = excluded.paused_duration_seconds,
-                is_active = excluded.is_active,
-                last_position_seconds = excluded.last_position_seconds,
-                last_state_is_paused = excluded.last_state_is_paused,
-                last_progress_update = excluded.last_progress_update
-            """,
-            (
-                session.session_id,
-                session.jellyfin_session_id,
-                session.user_id,
-                session.user_name,
-                session.device_id,
-                session.device_name,
-                session.client_name,
-                session.media_id,
-                session.media_title,
-                session.media_type,
-                session.series_name,
-                session.season_number,
-                session.episode_number,
-                session.started_at.isoformat(),
-                session.ended_at.isoformat() if session.ended_at else None,
-                session.play_duration_seconds,
-                session.paused_duration_seconds,
-                session.is_active,
-                session.last_position_seconds,
-                session.last_state_is_paused,
-                session.last_progress_update.isoformat(),
-            ),
-        )
+        cursor = await self.conn.execute(_UPSERT_SESSION_SQL, _session_params(session))
         await self.conn.commit()
         return cursor.lastrowid
 
+    async def bulk_create_sessions(
+        self, sessions: list[Session], skip_existing: bool = False
+    ) -> int:
+        """Create or update many sessions in a single transaction.
+
+        With skip_existing, rows whose session_id is already stored are left untouched.
+        Returns the number of rows written.
+        """
+        if not sessions:
+            return 0
+        sql = _INSERT_NEW_SESSION_SQL if skip_existing else _UPSERT_SESSION_SQL
+        try:
+            cursor = await self.conn.executemany(
+                sql, [_session_params(session) for session in sessions]
+            )
+            await self.conn.commit()
+        except Exception:
+            await self.conn.rollback()
+            raise
+        return cursor.rowcount
+
     async def get_active_session(self, session_id: str) -> Optional[Session]:
         """Get an active session by session ID."""
-        cursor = await self.conn.execute(
-            "SELECT * FROM sessions WHERE session_id = ? AND is_active = TRUE",
-            (session_id,),
-        )
-        row = await cursor.fetchone()
-        if row:
-            return self._row_to_session(row)
-        return None
+        async with self.read() as conn:
+            cursor = await conn.execute(
+                "SELECT * FROM sessions WHERE session_id = ? AND is_active = 1",
+                (session_id,),
+            )
+            row = await cursor.fetchone()
+            if row:
+                return self._row_to_session(row)
+            return None
 
     async def get_active_session_by_jellyfin_id(
         self, jellyfin_session_id: str
     ) -> Optional[Session]:
         """Get an active session by Jellyfin session ID."""
-        cursor = await self.conn.execute(
-            "SELECT * FROM sessions WHERE jellyfin_session_id = ? AND is_active = TRUE",
-            (jellyfin_session_id,),
-        )
-        row = await cursor.fetchone()
-        if row:
-            return self._row_to_session(row)
-        return None
+        async with self.read() as conn:
+            cursor = await conn.execute(
+                "SELECT * FROM sessions WHERE jellyfin_session_id = ? AND is_active = 1",
+                (jellyfin_session_id,),
+            )
+            row = await cursor.fetchone()
+            if row:
+                return self._row_to_session(row)
+            return None
 
     async def get_session_by_id(self, session_id: str) -> Optional[Session]:
         """Get any session by session ID (active or not)."""
-        cursor = await self.conn.execute(
-            "SELECT * FROM sessions WHERE session_id = ?",
-            (session_id,),
-        )
-        row = await cursor.fetchone()
-        if row:
-            return self._row_to_session(row)
-        return None
+        async with self.read() as conn:
+            cursor = await conn.execute(
+                "SELECT * FROM sessions WHERE session_id = ?",
+                (session_id,),
+            )
+            row = await cursor.fetchone()
+            if row:
+                return self._row_to_session(row)
+            return None
 
     async def update_session_state(
         self,
@@ -279,38 +487,58 @@ class Database:
     ) -> None:
         """Update session state with deltas and latest position."""
         await self.conn.execute(
-            """
-            UPDATE sessions
-            SET last_progress_update = ?,
-                play_duration_seconds = play_duration_seconds + ?,
-                paused_duration_seconds = paused_duration_seconds + ?,
-                last_position_seconds = ?,
-                last_state_is_paused = ?
-            WHERE session_id = ? AND is_active = TRUE
-            """,
-            (
-                now.isoformat(),
-                play_add_seconds,
-                paused_add_seconds,
-                position_seconds,
-                is_paused,
-                session_id,
+            _UPDATE_SESSION_STATE_SQL,
+            _session_state_params(
+                (session_id, position_seconds, is_paused, play_add_seconds, paused_add_seconds, now)
             ),
         )
         await self.conn.commit()
 
+    async def bulk_update_session_state(self, updates: list[SessionStateUpdate]) -> None:
+        """Apply many session state updates in a single transaction."""
+        if not updates:
+            return
+        try:
+            await self.conn.executemany(
+                _UPDATE_SESSION_STATE_SQL, [_session_state_params(update) for update in updates]
+            )
+            await self.conn.commit()
+        except Exception:
+            await self.conn.rollback()
+            raise
+
     async def end_session(self, session_id: str) -> None:
         """End a playback session."""
         now = datetime.now()
-        await self.conn.execute(
+        await self.conn.execute(_END_SESSION_SQL, (now.isoformat(), session_id))
+        await self.conn.commit()
+
+    async def bulk_end_sessions(self, session_ids: list[str]) -> None:
+        """End many playback sessions in a single transaction."""
+        if not session_ids:
+            return
+        ended_at = datetime.now().isoformat()
+        try:
+            await self.conn.executemany(
+                _END_SESSION_SQL, [(ended_at, session_id) for session_id in session_ids]
+            )
+            await self.conn.commit()
+        except Exception:
+            await self.conn.rollback()
+            raise
+
+    async def timeout_session(self, session_id: str) -> bool:
+        """End a single session that stopped receiving updates."""
+        cursor = await self.conn.execute(
             """
             UPDATE sessions
-            SET ended_at = ?, is_active = FALSE
-            WHERE session_id = ? AND is_active = TRUE
+            SET ended_at = last_progress_update, is_active = 0
+            WHERE session_id = ? AND is_active = 1
             """,
-            (now.isoformat(), session_id),
+            (session_id,),
         )
         await self.conn.commit()
+        return cursor.rowcount > 0
 
     async def timeout_stale_sessions(self, timeout_minutes: int) -> int:
         """End sessions that haven't received updates within timeout period."""
@@ -318,8 +546,8 @@ class Database:
         cursor = await self.conn.execute(
             """
             UPDATE sessions
-            SET ended_at = last_progress_update, is_active = FALSE
-            WHERE is_active = TRUE AND last_progress_update < ?
+            SET ended_at = last_progress_update, is_active = 0
+            WHERE is_active = 1 AND last_progress_update < ?
             """,
             (cutoff.isoformat(),),
         )
@@ -328,81 +556,116 @@ class Database:
 
     async def aggregate_and_prune(self, retention_days: int) -> int:
         """Aggregate and prune sessions older than retention_days."""
+        # Runs on its own connection in a worker thread so the event loop stays free.
+        # It still takes SQLite's single write lock, so the work is split into short
+        # transactions that live writes can queue behind within busy_timeout.
+        return await asyncio.to_thread(self.aggregate_and_prune_sync, retention_days)
+
+    def aggregate_and_prune_sync(self, retention_days: int) -> int:
+        """Blocking aggregate-and-prune on a private connection; call from a thread."""
         cutoff = datetime.now() - timedelta(days=retention_days)
         cutoff_iso = cutoff.isoformat()
-        await self.conn.execute("BEGIN")
+        conn = sqlite3.connect(self.db_path, timeout=30.0)
+        pruned = 0
         try:
-            await self.conn.execute(
-                """
-                INSERT INTO session_aggregates (
-                    date, hour, user_id, user_name, media_id, media_title, media_type,
-                    series_name, device_name, client_name, session_count, play_seconds,
-                    paused_seconds
-                )
-                SELECT
-                    date(started_at) as date,
-                    CAST(strftime('%H', started_at) AS INTEGER) as hour,
-                    user_id,
-                    MAX(user_name) as user_name,
-                    media_id,
-                    MAX(media_title) as media_title,
-                    MAX(media_type) as media_type,
-                    MAX(series_name) as series_name,
-                    device_name,
-                    client_name,
-                    COUNT(*) as session_count,
-                    SUM(play_duration_seconds) as play_seconds,
-                    SUM(paused_duration_seconds) as paused_seconds
-                FROM sessions
-                WHERE started_at < ? AND is_active = FALSE
-                GROUP BY date, hour, user_id, media_id, device_name, client_name
-                ON CONFLICT(date, hour, user_id, media_id, device_name, client_name)
-                DO UPDATE SET
-                    session_count = session_count + excluded.session_count,
-                    play_seconds = play_seconds + excluded.play_seconds,
-                    paused_seconds = paused_seconds + excluded.paused_seconds,
-                    user_name = excluded.user_name,
-                    media_title = excluded.media_title,
-                    media_type = excluded.media_type,
-                    series_name = excluded.series_name
-                """,
-                (cutoff_iso,),
-            )
-            cursor = await self.conn.execute(
-                """
-                DELETE FROM sessions
-                WHERE started_at < ? AND is_active = FALSE
-                """,
-                (cutoff_iso,),
-            )
-            await self.conn.commit()
-            return cursor.rowcount
+            while True:
+                # Each batch is aggregated and deleted atomically; the connection
+                # context manager commits it, or rolls it back on error
+                with conn:
+                    conn.execute("BEGIN IMMEDIATE")
+                    ids = [
+                        row[0]
+                        for row in conn.execute(
+                            _PRUNE_BATCH_IDS_SQL, (cutoff_iso, _PRUNE_BATCH_SIZE)
+                        )
+                    ]
+                    if ids:
+                        batch = json.dumps(ids)
+                        conn.execute(_AGGREGATE_SESSIONS_SQL, (batch,))
+                        pruned += conn.execute(_PRUNE_SESSIONS_SQL, (batch,)).rowcount
+                if len(ids) < _PRUNE_BATCH_SIZE:
+                    return pruned
         except Exception as e:
-            logger.error(f"Aggregation failed, rolling back: {e}")
-            try:
-                await self.conn.execute("ROLLBACK")
-            except Exception as rollback_error:
-                logger.error(f"Rollback also failed: {rollback_error}")
+            logger.error(f"Aggregation failed after pruning {pruned} sessions: {e}")
             raise
+        finally:
+            conn.close()
 
     async def get_active_sessions(
         self,
         user_id: Optional[str] = None,
         device_name: Optional[str] = None,
         media_type: Optional[str] = None,
+        exclude_users: bool = True,
     ) -> list[Session]:
-        """Get all active sessions."""
-        filters, params = self._build_filter_clause(user_id, device_name, media_type)
-        cursor = await self.conn.execute(
-            f"""
-            SELECT * FROM sessions
-            WHERE is_active = TRUE{filters}
-            ORDER BY started_at DESC
-            """,
-            params,
-        )
-        rows = await cursor.fetchall()
-        return [self._row_to_session(row) for row in rows]
+        """Get all active sessions.
+
+        Pass ``exclude_users=False`` to include sessions of excluded users, which
+        the tracker still has to follow even though the dashboard hides them.
+        """
+        async with self.read() as conn:
+            filters, params = self._build_filter_clause(
+                user_id, device_name, media_type, exclude_users=exclude_users
+            )
+            cursor = await conn.execute(
+                f"""
+                SELECT * FROM sessions
+                WHERE is_active = 1{filters}
+                ORDER BY started_at DESC
+                """,
+                params,
+            )
+            rows = await cursor.fetchall()
+            return [self._row_to_session(row) for row in rows]
+
+    async def get_active_sessions_light(
+        self,
+        user_id: Optional[str] = None,
+        device_name: Optional[str] = None,
+        media_type: Optional[str] = None,
+    ) -> list[dict]:
+        """Get active sessions with only the columns the dashboard widget renders."""
+        async with self.read() as conn:
+            filters, params = self._build_filter_clause(user_id, device_name, media_type)
+            cursor = await conn.execute(
+                f"""
+                SELECT
+                    session_id,
+                    user_name,
+                    device_name,
+                    client_name,
+                    media_title,
+                    series_name,
+                    season_number,
+                    episode_number,
+                    started_at,
+                    play_duration_seconds,
+                    paused_duration_seconds,
+                    last_state_is_paused
+                FROM sessions
+                WHERE is_active = 1{filters}
+                ORDER BY started_at DESC
+                """,
+                params,
+            )
+            rows = await cursor.fetchall()
+            return [
+                {
+                    "session_id": row["session_id"],
+                    "user_name": row["user_name"],
+                    "device_name": row["device_name"],
+                    "client_name": row["client_name"],
+                    "media_title": row["media_title"],
+                    "series_name": row["series_name"],
+                    "season_number": row["season_number"],
+                    "episode_number": row["episode_number"],
+                    "started_at": row["started_at"],
+                    "play_duration_seconds": row["play_duration_seconds"] or 0,
+                    "paused_duration_seconds": row["paused_duration_seconds"] or 0,
+                    "last_state_is_paused": bool(row["last_state_is_paused"]),
+                }
+                for row in rows
+            ]
 
     async def get_user_watchtime(
         self,
@@ -412,65 +675,66 @@ class Database:
         media_type: Optional[str] = None,
     ) -> list[UserWatchtime]:
         """Get watchtime statistics per user."""
-        since = datetime.now() - timedelta(days=days)
-        filters, params = self._build_filter_clause(user_id, device_name, media_type)
-        if self._include_aggregates(days):
-            cursor = await self.conn.execute(
-                f"""
-                SELECT
-                    user_id,
-                    user_name,
-                    SUM(total_seconds) as total_seconds,
-                    SUM(session_count) as session_count
-                FROM (
+        async with self.read() as conn:
+            since = datetime.now() - timedelta(days=days)
+            filters, params = self._build_filter_clause(user_id, device_name, media_type)
+            if self._include_aggregates(days):
+                cursor = await conn.execute(
+                    f"""
                     SELECT
                         user_id,
                         user_name,
-                        SUM(play_duration_seconds) as total_seconds,
-                        COUNT(*) as session_count
-                    FROM sessions
-                    WHERE started_at >= ?{filters}
+                        SUM(total_seconds) as total_seconds,
+                        SUM(session_count) as session_count
+                    FROM (
+                        SELECT
+                            user_id,
+                            user_name,
+                            SUM(play_duration_seconds) as total_seconds,
+                            COUNT(*) as session_count
+                        FROM sessions
+                        WHERE started_at >= ?{filters}
+                        GROUP BY user_id, user_name
+                        UNION ALL
+                        SELECT
+                            user_id,
+                            user_name,
+                            SUM(play_seconds) as total_seconds,
+                            SUM(session_count) as session_count
+                        FROM session_aggregates
+                        WHERE date >= ?{filters}
+                        GROUP BY user_id, user_name
+                    )
                     GROUP BY user_id, user_name
-                    UNION ALL
+                    ORDER BY total_seconds DESC
+                    """,
+                    (since.isoformat(), *params, since.date().isoformat(), *params),
+                )
+            else:
+                cursor = await conn.execute(
+                    f"""
                     SELECT
                         user_id,
                         user_name,
-                        SUM(play_seconds) as total_seconds,
-                        SUM(session_count) as session_count
-                    FROM session_aggregates
-                    WHERE date >= ?{filters}
+                        SUM(play_duration_seconds) as total_seconds,
+                        COUNT(*) as session_count
+                    FROM sessions
+                    WHERE started_at >= ?{filters}
                     GROUP BY user_id, user_name
+                    ORDER BY total_seconds DESC
+                    """,
+                    (since.isoformat(), *params),
                 )
-                GROUP BY user_id, user_name
-                ORDER BY total_seconds DESC
-                """,
-                (since.isoformat(), *params, since.date().isoformat(), *params),
-            )
-        else:
-            cursor = await self.conn.execute(
-                f"""
-                SELECT
-                    user_id,
-                    user_name,
-                    SUM(play_duration_seconds) as total_seconds,
-                    COUNT(*) as session_count
-                FROM sessions
-                WHERE started_at >= ?{filters}
-                GROUP BY user_id, user_name
-                ORDER BY total_seconds DESC
-                """,
-                (since.isoformat(), *params),
-            )
-        rows = await cursor.fetchall()
-        return [
-            UserWatchtime(
-                user_id=row["user_id"],
-                user_name=row["user_name"],
-                total_seconds=row["total_seconds"] or 0,
-                session_count=row["session_count"],
-            )
-            for row in rows
-        ]
+            rows = await cursor.fetchall()
+            return [
+                UserWatchtime.model_construct(
+                    user_id=row["user_id"],
+                    user_name=row["user_name"],
+                    total_seconds=row["total_seconds"] or 0,
+                    session_count=row["session_count"],
+                )
+                for row in rows
+            ]
 
     async def get_top_media(
         self,
@@ -481,110 +745,111 @@ class Database:
         media_type: Optional[str] = None,
     ) -> list[TopMedia]:
         """Get top watched media."""
-        since = datetime.now() - timedelta(days=days)
-        filters, params = self._build_filter_clause(user_id, device_name, media_type)
-        if self._include_aggregates(days):
-            cursor = await self.conn.execute(
-                f"""
-                WITH base AS (
-                    SELECT
-                        CASE
-                            WHEN media_type = 'Episode' AND series_name IS NOT NULL
-                                THEN series_name
-                            ELSE media_id
-                        END as media_id,
-                        CASE
-                            WHEN media_type = 'Episode' AND series_name IS NOT NULL
-                                THEN series_name
-                            ELSE media_title
-                        END as media_title,
-                        media_type,
-                        series_name,
-                        play_duration_seconds as total_seconds,
-                        1 as play_count
-                    FROM sessions
-                    WHERE started_at >= ?{filters}
-                    UNION ALL
+        async with self.read() as conn:
+            since = datetime.now() - timedelta(days=days)
+            filters, params = self._build_filter_clause(user_id, device_name, media_type)
+            if self._include_aggregates(days):
+                cursor = await conn.execute(
+                    f"""
+                    WITH base AS (
+                        SELECT
+                            CASE
+                                WHEN media_type = 'Episode' AND series_name IS NOT NULL
+                                    THEN series_name
+                                ELSE media_id
+                            END as media_id,
+                            CASE
+                                WHEN media_type = 'Episode' AND series_name IS NOT NULL
+                                    THEN series_name
+                                ELSE media_title
+                            END as media_title,
+                            media_type,
+                            series_name,
+                            play_duration_seconds as total_seconds,
+                            1 as play_count
+                        FROM sessions
+                        WHERE started_at >= ?{filters}
+                        UNION ALL
+                        SELECT
+                            CASE
+                                WHEN media_type = 'Episode' AND series_name IS NOT NULL
+                                    THEN series_name
+                                ELSE media_id
+                            END as media_id,
+                            CASE
+                                WHEN media_type = 'Episode' AND series_name IS NOT NULL
+                                    THEN series_name
+                                ELSE media_title
+                            END as media_title,
+                            media_type,
+                            series_name,
+                            play_seconds as total_seconds,
+                            session_count as play_count
+                        FROM session_aggregates
+                        WHERE date >= ?{filters}
+                    )
                     SELECT
-                        CASE
-                            WHEN media_type = 'Episode' AND series_name IS NOT NULL
-                                THEN series_name
-                            ELSE media_id
-                        END as media_id,
-                        CASE
-                            WHEN media_type = 'Episode' AND series_name IS NOT NULL
-                                THEN series_name
-                            ELSE media_title
-                        END as media_title,
+                        media_id,
+                        media_title,
                         media_type,
                         series_name,
-                        play_seconds as total_seconds,
-                        session_count as play_count
-                    FROM session_aggregates
-                    WHERE date >= ?{filters}
+                        SUM(total_seconds) as total_seconds,
+                        SUM(play_count) as play_count
+                    FROM base
+                    GROUP BY media_id, media_title, media_type, series_name
+                    ORDER BY total_seconds DESC
+                    LIMIT ?
+                    """,
+                    (since.isoformat(), *params, since.date().isoformat(), *params, limit),
                 )
-                SELECT
-                    media_id,
-                    media_title,
-                    media_type,
-                    series_name,
-                    SUM(total_seconds) as total_seconds,
-                    SUM(play_count) as play_count
-                FROM base
-                GROUP BY media_id, media_title, media_type, series_name
-                ORDER BY total_seconds DESC
-                LIMIT ?
-                """,
-                (since.isoformat(), *params, since.date().isoformat(), *params, limit),
-            )
-        else:
-            cursor = await self.conn.execute(
-                f"""
-                WITH base AS (
+            else:
+                cursor = await conn.execute(
+                    f"""
+                    WITH base AS (
+                        SELECT
+                            CASE
+                                WHEN media_type = 'Episode' AND series_name IS NOT NULL
+                                    THEN series_name
+                                ELSE media_id
+                            END as media_id,
+                            CASE
+                                WHEN media_type = 'Episode' AND series_name IS NOT NULL
+                                    THEN series_name
+                                ELSE media_title
+                            END as media_title,
+                            media_type,
+                            series_name,
+                            play_duration_seconds as total_seconds,
+                            1 as play_count
+                        FROM sessions
+                        WHERE started_at >= ?{filters}
+                    )
                     SELECT
-                        CASE
-                            WHEN media_type = 'Episode' AND series_name IS NOT NULL
-                                THEN series_name
-                            ELSE media_id
-                        END as media_id,
-                        CASE
-                            WHEN media_type = 'Episode' AND series_name IS NOT NULL
-                                THEN series_name
-                            ELSE media_title
-                        END as media_title,
+                        media_id,
+                        media_title,
                         media_type,
                         series_name,
-                        play_duration_seconds as total_seconds,
-                        1 as play_count
-                    FROM sessions
-                    WHERE started_at >= ?{filters}
+                        SUM(total_seconds) as total_seconds,
+                        SUM(play_count) as play_count
+                    FROM base
+                    GROUP BY media_id, media_title, media_type, series_name
+                    ORDER BY total_seconds DESC
+                    LIMIT ?
+                    """,
+                    (since.isoformat(), *params, limit),
                 )
-                SELECT
-                    media_id,
-                    media_title,
-                    media_type,
-                    series_name,
-                    SUM(total_seconds) as total_seconds,
-                    SUM(play_count) as play_count
-                FROM base
-                GROUP BY media_id, media_title, media_type, series_name
-                ORDER BY total_seconds DESC
-                LIMIT ?
-                """,
-                (since.isoformat(), *params, limit),
-            )
-        rows = await cursor.fetchall()
-        return [
-            TopMedia(
-                media_id=row["media_id"],
-                media_title=row["media_title"],
-                media_type=row["media_type"],
-                series_name=row["series_name"],
-                total_seconds=row["total_seconds"] or 0,
-                play_count=row["play_count"],
-            )
-            for row in rows
-        ]
+            rows = await cursor.fetchall()
+            return [
+                TopMedia.model_construct(
+                    media_id=row["media_id"],
+                    media_title=row["media_title"],
+                    media_type=row["media_type"],
+                    series_name=row["series_name"],
+                    total_seconds=row["total_seconds"] or 0,
+                    play_count=row["play_count"],
+                )
+                for row in rows
+            ]
 
     async def get_hourly_stats(
         self,
@@ -594,60 +859,61 @@ class Database:
         media_type: Optional[str] = None,
     ) -> list[HourlyStats]:
         """Get usage statistics by hour of day."""
-        since = datetime.now() - timedelta(days=days)
-        filters, params = self._build_filter_clause(user_id, device_name, media_type)
-        if self._include_aggregates(days):
-            cursor = await self.conn.execute(
-                f"""
-                SELECT
-                    hour,
-                    SUM(session_count) as session_count,
-                    SUM(total_seconds) as total_seconds
-                FROM (
+        async with self.read() as conn:
+            since = datetime.now() - timedelta(days=days)
+            filters, params = self._build_filter_clause(user_id, device_name, media_type)
+            if self._include_aggregates(days):
+                cursor = await conn.execute(
+                    f"""
                     SELECT
-                        CAST(strftime('%H', started_at) AS INTEGER) as hour,
+                        hour,
+                        SUM(session_count) as session_count,
+                        SUM(total_seconds) as total_seconds
+                    FROM (
+                        SELECT
+                            hour_of_day as hour,
+                            COUNT(*) as session_count,
+                            SUM(play_duration_seconds) as total_seconds
+                        FROM sessions
+                        WHERE started_at >= ?{filters}
+                        GROUP BY hour_of_day
+                        UNION ALL
+                        SELECT
+                            hour,
+                            SUM(session_count) as session_count,
+                            SUM(play_seconds) as total_seconds
+                        FROM session_aggregates
+                        WHERE date >= ?{filters}
+                        GROUP BY hour
+                    )
+                    GROUP BY hour
+                    ORDER BY hour
+                    """,
+                    (since.isoformat(), *params, since.date().isoformat(), *params),
+                )
+            else:
+                cursor = await conn.execute(
+                    f"""
+                    SELECT
+                        hour_of_day as hour,
                         COUNT(*) as session_count,
                         SUM(play_duration_seconds) as total_seconds
                     FROM sessions
                     WHERE started_at >= ?{filters}
-                    GROUP BY hour
-                    UNION ALL
-                    SELECT
-                        hour,
-                        SUM(session_count) as session_count,
-                        SUM(play_seconds) as total_seconds
-                    FROM session_aggregates
-                    WHERE date >= ?{filters}
-                    GROUP BY hour
+                    GROUP BY hour_of_day
+                    ORDER BY hour_of_day
+                    """,
+                    (since.isoformat(), *params),
                 )
-                GROUP BY hour
-                ORDER BY hour
-                """,
-                (since.isoformat(), *params, since.date().isoformat(), *params),
-            )
-        else:
-            cursor = await self.conn.execute(
-                f"""
-                SELECT
-                    CAST(strftime('%H', started_at) AS INTEGER) as hour,
-                    COUNT(*) as session_count,
-                    SUM(play_duration_seconds) as total_seconds
-                FROM sessions
-                WHERE started_at >= ?{filters}
-                GROUP BY hour
-                ORDER BY hour
-                """,
-                (since.isoformat(), *params),
-            )
-        rows = await cursor.fetchall()
-        return [
-            HourlyStats(
-                hour=row["hour"],
-                session_count=row["session_count"],
-                total_seconds=row["total_seconds"] or 0,
-            )
-            for row in rows
-        ]
+            rows = await cursor.fetchall()
+            return [
+                HourlyStats.model_construct(
+                    hour=row["hour"],
+                    session_count=row["session_count"],
+                    total_seconds=row["total_seconds"] or 0,
+                )
+                for row in rows
+            ]
 
     async def get_device_stats(
         self,
@@ -657,65 +923,66 @@ class Database:
         media_type: Optional[str] = None,
     ) -> list[DeviceStats]:
         """Get device usage statistics."""
-        since = datetime.now() - timedelta(days=days)
-        filters, params = self._build_filter_clause(user_id, device_name, media_type)
-        if self._include_aggregates(days):
-            cursor = await self.conn.execute(
-                f"""
-                SELECT
-                    device_name,
-                    client_name,
-                    SUM(session_count) as session_count,
-                    SUM(total_seconds) as total_seconds
-                FROM (
+        async with self.read() as conn:
+            since = datetime.now() - timedelta(days=days)
+            filters, params = self._build_filter_clause(user_id, device_name, media_type)
+            if self._include_aggregates(days):
+                cursor = await conn.execute(
+                    f"""
                     SELECT
                         device_name,
                         client_name,
-                        COUNT(*) as session_count,
-                        SUM(play_duration_seconds) as total_seconds
-                    FROM sessions
-                    WHERE started_at >= ?{filters}
+                        SUM(session_count) as session_count,
+                        SUM(total_seconds) as total_seconds
+                    FROM (
+                        SELECT
+                            device_name,
+                            client_name,
+                            COUNT(*) as session_count,
+                            SUM(play_duration_seconds) as total_seconds
+                        FROM sessions
+                        WHERE started_at >= ?{filters}
+                        GROUP BY device_name, client_name
+                        UNION ALL
+                        SELECT
+                            device_name,
+                            client_name,
+                            SUM(session_count) as session_count,
+                            SUM(play_seconds) as total_seconds
+                        FROM session_aggregates
+                        WHERE date >= ?{filters}
+                        GROUP BY device_name, client_name
+                    )
                     GROUP BY device_name, client_name
-                    UNION ALL
+                    ORDER BY total_seconds DESC
+                    """,
+                    (since.isoformat(), *params, since.date().isoformat(), *params),
+                )
+            else:
+                cursor = await conn.execute(
+                    f"""
                     SELECT
                         device_name,
                         client_name,
-                        SUM(session_count) as session_count,
-                        SUM(play_seconds) as total_seconds
-                    FROM session_aggregates
-                    WHERE date >= ?{filters}
+                        COUNT(*) as session_count,
+                        SUM(play_duration_seconds) as total_seconds
+                    FROM sessions
+                    WHERE started_at >= ?{filters}
                     GROUP BY device_name, client_name
+                    ORDER BY total_seconds DESC
+                    """,
+                    (since.isoformat(), *params),
                 )
-                GROUP BY device_name, client_name
-                ORDER BY total_seconds DESC
-                """,
-                (since.isoformat(), *params, since.date().isoformat(), *params),
-            )
-        else:
-            cursor = await self.conn.execute(
-                f"""
-                SELECT
-                    device_name,
-                    client_name,
-                    COUNT(*) as session_count,
-                    SUM(play_duration_seconds) as total_seconds
-                FROM sessions
-                WHERE started_at >= ?{filters}
-                GROUP BY device_name, client_name
-                ORDER BY total_seconds DESC
-                """,
-                (since.isoformat(), *params),
-            )
-        rows = await cursor.fetchall()
-        return [
-            DeviceStats(
-                device_name=row["device_name"],
-                client_name=row["client_name"],
-                session_count=row["session_count"],
-                total_seconds=row["total_seconds"] or 0,
-            )
-            for row in rows
-        ]
+            rows = await cursor.fetchall()
+            return [
+                DeviceStats.model_construct(
+                    device_name=row["device_name"],
+                    client_name=row["client_name"],
+                    session_count=row["session_count"],
+                    total_seconds=row["total_seconds"] or 0,
+                )
+                for row in rows
+            ]
 
     async def get_pause_ratio_by_device(
         self,
@@ -725,18 +992,47 @@ class Database:
         media_type: Optional[str] = None,
     ) -> list[dict]:
         """Get play vs pause totals per device/client."""
-        since = datetime.now() - timedelta(days=days)
-        filters, params = self._build_filter_clause(user_id, device_name, media_type)
-        if self._include_aggregates(days):
-            cursor = await self.conn.execute(
-                f"""
-                SELECT
-                    device_name,
-                    client_name,
-                    SUM(play_seconds) as play_seconds,
-                    SUM(paused_seconds) as paused_seconds,
-                    SUM(session_count) as session_count
-                FROM (
+        async with self.read() as conn:
+            since = datetime.now() - timedelta(days=days)
+            filters, params = self._build_filter_clause(user_id, device_name, media_type)
+            if self._include_aggregates(days):
+                cursor = await conn.execute(
+                    f"""
+                    SELECT
+                        device_name,
+                        client_name,
+                        SUM(play_seconds) as play_seconds,
+                        SUM(paused_seconds) as paused_seconds,
+                        SUM(session_count) as session_count
+                    FROM (
+                        SELECT
+                            device_name,
+                            client_name,
+                            COALESCE(SUM(play_duration_seconds), 0) as play_seconds,
+                            COALESCE(SUM(paused_duration_seconds), 0) as paused_seconds,
+                            COUNT(*) as session_count
+                        FROM sessions
+                        WHERE started_at >= ?{filters}
+                        GROUP BY device_name, client_name
+                        UNION ALL
+                        SELECT
+                            device_name,
+                            client_name,
+                            COALESCE(SUM(play_seconds), 0) as play_seconds,
+                            COALESCE(SUM(paused_seconds), 0) as paused_seconds,
+                            COALESCE(SUM(session_count), 0) as session_count
+                        FROM session_aggregates
+                        WHERE date >= ?{filters}
+                        GROUP BY device_name, client_name
+                    )
+                    GROUP BY device_name, client_name
+                    ORDER BY (play_seconds + paused_seconds) DESC
+                    """,
+                    (since.isoformat(), *params, since.date().isoformat(), *params),
+                )
+            else:
+                cursor = await conn.execute(
+                    f"""
                     SELECT
                         device_name,
                         client_name,
@@ -746,49 +1042,21 @@ class Database:
                     FROM sessions
                     WHERE started_at >= ?{filters}
                     GROUP BY device_name, client_name
-                    UNION ALL
-                    SELECT
-                        device_name,
-                        client_name,
-                        COALESCE(SUM(play_seconds), 0) as play_seconds,
-                        COALESCE(SUM(paused_seconds), 0) as paused_seconds,
-                        COALESCE(SUM(session_count), 0) as session_count
-                    FROM session_aggregates
-                    WHERE date >= ?{filters}
-                    GROUP BY device_name, client_name
+                    ORDER BY (play_seconds + paused_seconds) DESC
+                    """,
+                    (since.isoformat(), *params),
                 )
-                GROUP BY device_name, client_name
-                ORDER BY (play_seconds + paused_seconds) DESC
-                """,
-                (since.isoformat(), *params, since.date().isoformat(), *params),
-            )
-        else:
-            cursor = await self.conn.execute(
-                f"""
-                SELECT
-                    device_name,
-                    client_name,
-                    COALESCE(SUM(play_duration_seconds), 0) as play_seconds,
-                    COALESCE(SUM(paused_duration_seconds), 0) as paused_seconds,
-                    COUNT(*) as session_count
-                FROM sessions
-                WHERE started_at >= ?{filters}
-                GROUP BY device_name, client_name
-                ORDER BY (play_seconds + paused_seconds) DESC
-                """,
-                (since.isoformat(), *params),
-            )
-        rows = await cursor.fetchall()
-        return [
-            {
-                "device_name": row["device_name"],
-                "client_name": row["client_name"],
-                "play_seconds": row["play_seconds"] or 0,
-                "paused_seconds": row["paused_seconds"] or 0,
-                "session_count": row["session_count"] or 0,
-            }
-            for row in rows
-        ]
+            rows = await cursor.fetchall()
+            return [
+                {
+                    "device_name": row["device_name"],
+                    "client_name": row["client_name"],
+                    "play_seconds": row["play_seconds"] or 0,
+                    "paused_seconds": row["paused_seconds"] or 0,
+                    "session_count": row["session_count"] or 0,
+                }
+                for row in rows
+            ]
 
     async def get_hourly_weekday_heatmap(
         self,
@@ -798,60 +1066,61 @@ class Database:
         media_type: Optional[str] = None,
     ) -> list[dict]:
         """Get watchtime per weekday/hour (seconds)."""
-        since = datetime.now() - timedelta(days=days)
-        filters, params = self._build_filter_clause(user_id, device_name, media_type)
-        if self._include_aggregates(days):
-            cursor = await self.conn.execute(
-                f"""
-                SELECT
-                    weekday,
-                    hour,
-                    SUM(play_seconds) as watch_seconds
-                FROM (
+        async with self.read() as conn:
+            since = datetime.now() - timedelta(days=days)
+            filters, params = self._build_filter_clause(user_id, device_name, media_type)
+            if self._include_aggregates(days):
+                cursor = await conn.execute(
+                    f"""
+                    SELECT
+                        weekday,
+                        hour,
+                        SUM(play_seconds) as watch_seconds
+                    FROM (
+                        SELECT
+                            CAST(strftime('%w', started_at) AS INTEGER) as weekday,
+                            CAST(strftime('%H', started_at) AS INTEGER) as hour,
+                            SUM(play_duration_seconds) as play_seconds
+                        FROM sessions
+                        WHERE started_at >= ?{filters}
+                        GROUP BY weekday, hour
+                        UNION ALL
+                        SELECT
+                            CAST(strftime('%w', date) AS INTEGER) as weekday,
+                            hour,
+                            SUM(play_seconds) as play_seconds
+                        FROM session_aggregates
+                        WHERE date >= ?{filters}
+                        GROUP BY weekday, hour
+                    )
+                    GROUP BY weekday, hour
+                    ORDER BY weekday, hour
+                    """,
+                    (since.isoformat(), *params, since.date().isoformat(), *params),
+                )
+            else:
+                cursor = await conn.execute(
+                    f"""
                     SELECT
                         CAST(strftime('%w', started_at) AS INTEGER) as weekday,
                         CAST(strftime('%H', started_at) AS INTEGER) as hour,
-                        SUM(play_duration_seconds) as play_seconds
+                        SUM(play_duration_seconds) as watch_seconds
                     FROM sessions
                     WHERE started_at >= ?{filters}
                     GROUP BY weekday, hour
-                    UNION ALL
-                    SELECT
-                        CAST(strftime('%w', date) AS INTEGER) as weekday,
-                        hour,
-                        SUM(play_seconds) as play_seconds
-                    FROM session_aggregates
-                    WHERE date >= ?{filters}
-                    GROUP BY weekday, hour
+                    ORDER BY weekday, hour
+                    """,
+                    (since.isoformat(), *params),
                 )
-                GROUP BY weekday, hour
-                ORDER BY weekday, hour
-                """,
-                (since.isoformat(), *params, since.date().isoformat(), *params),
-            )
-        else:
-            cursor = await self.conn.execute(
-                f"""
-                SELECT
-                    CAST(strftime('%w', started_at) AS INTEGER) as weekday,
-                    CAST(strftime('%H', started_at) AS INTEGER) as hour,
-                    SUM(play_duration_seconds) as watch_seconds
-                FROM sessions
-                WHERE started_at >= ?{filters}
-                GROUP BY weekday, hour
-                ORDER BY weekday, hour
-                """,
-                (since.isoformat(), *params),
-            )
-        rows = await cursor.fetchall()
-        return [
-            {
-                "weekday": row["weekday"],
-                "hour": row["hour"],
-                "watch_seconds": row["watch_seconds"] or 0,
-            }
-            for row in rows
-        ]
+            rows = await cursor.fetchall()
+            return [
+                {
+                    "weekday": row["weekday"],
+                    "hour": row["hour"],
+                    "watch_seconds": row["watch_seconds"] or 0,
+                }
+                for row in rows
+            ]
 
     async def get_series_daily_totals(
         self,
@@ -861,16 +1130,41 @@ class Database:
         media_type: Optional[str] = None,
     ) -> list[dict]:
         """Get daily totals per series."""
-        since = datetime.now() - timedelta(days=days)
-        filters, params = self._build_filter_clause(user_id, device_name, media_type)
-        if self._include_aggregates(days):
-            cursor = await self.conn.execute(
-                f"""
-                SELECT
-                    date,
-                    series_name,
-                    SUM(total_seconds) as total_seconds
-                FROM (
+        async with self.read() as conn:
+            since = datetime.now() - timedelta(days=days)
+            filters, params = self._build_filter_clause(user_id, device_name, media_type)
+            if self._include_aggregates(days):
+                cursor = await conn.execute(
+                    f"""
+                    SELECT
+                        date,
+                        series_name,
+                        SUM(total_seconds) as total_seconds
+                    FROM (
+                        SELECT
+                            date(started_at) as date,
+                            series_name,
+                            SUM(play_duration_seconds) as total_seconds
+                        FROM sessions
+                        WHERE started_at >= ?{filters} AND series_name IS NOT NULL
+                        GROUP BY date, series_name
+                        UNION ALL
+                        SELECT
+                            date,
+                            series_name,
+                            SUM(play_seconds) as total_seconds
+                        FROM session_aggregates
+                        WHERE date >= ?{filters} AND series_name IS NOT NULL
+                        GROUP BY date, series_name
+                    )
+                    GROUP BY date, series_name
+                    ORDER BY date
+                    """,
+                    (since.isoformat(), *params, since.date().isoformat(), *params),
+                )
+            else:
+                cursor = await conn.execute(
+                    f"""
                     SELECT
                         date(started_at) as date,
                         series_name,
@@ -878,43 +1172,19 @@ class Database:
                     FROM sessions
                     WHERE started_at >= ?{filters} AND series_name IS NOT NULL
                     GROUP BY date, series_name
-                    UNION ALL
-                    SELECT
-                        date,
-                        series_name,
-                        SUM(play_seconds) as total_seconds
-                    FROM session_aggregates
-                    WHERE date >= ?{filters} AND series_name IS NOT NULL
-                    GROUP BY date, series_name
+                    ORDER BY date
+                    """,
+                    (since.isoformat(), *params),
                 )
-                GROUP BY date, series_name
-                ORDER BY date
-                """,
-                (since.isoformat(), *params, since.date().isoformat(), *params),
-            )
-        else:
-            cursor = await self.conn.execute(
-                f"""
-                SELECT
-                    date(started_at) as date,
-                    series_name,
-                    SUM(play_duration_seconds) as total_seconds
-                FROM sessions
-                WHERE started_at >= ?{filters} AND series_name IS NOT NULL
-                GROUP BY date, series_name
-                ORDER BY date
-                """,
-                (since.isoformat(), *params),
-            )
-        rows = await cursor.fetchall()
-        return [
-            {
-                "date": row["date"],
-                "series_name": row["series_name"],
-                "total_seconds": row["total_seconds"] or 0,
-            }
-            for row in rows
-        ]
+            rows = await cursor.fetchall()
+            return [
+                {
+                    "date": row["date"],
+                    "series_name": row["series_name"],
+                    "total_seconds": row["total_seconds"] or 0,
+                }
+                for row in rows
+            ]
 
     async def get_sessions_for_metrics(
         self,
@@ -924,42 +1194,56 @@ class Database:
         media_type: Optional[str] = None,
     ) -> list[dict]:
         """Get sessions for derived metrics (distribution/concurrency/completion)."""
-        since = datetime.now() - timedelta(days=days)
-        filters, params = self._build_filter_clause(user_id, device_name, media_type)
-        cursor = await self.conn.execute(
-            f"""
-            SELECT
-                session_id,
-                media_id,
-                media_type,
-                started_at,
-                ended_at,
-                is_active,
-                play_duration_seconds,
-                paused_duration_seconds,
-                last_position_seconds,
-                last_progress_update
-            FROM sessions
-            WHERE (started_at >= ? OR ended_at >= ? OR is_active = TRUE){filters}
-            """,
-            (since.isoformat(), since.isoformat(), *params),
-        )
-        rows = await cursor.fetchall()
-        return [
-            {
-                "session_id": row["session_id"],
-                "media_id": row["media_id"],
-                "media_type": row["media_type"],
-                "started_at": row["started_at"],
-                "ended_at": row["ended_at"],
-                "is_active": bool(row["is_active"]),
-                "play_seconds": row["play_duration_seconds"] or 0,
-                "paused_seconds": row["paused_duration_seconds"] or 0,
-                "last_position_seconds": row["last_position_seconds"] or 0,
-                "last_progress_update": row["last_progress_update"],
-            }
-            for row in rows
-        ]
+        async with self.read() as conn:
+            since = datetime.now() - timedelta(days=days)
+            filters, params = self._build_filter_clause(user_id, device_name, media_type)
+            cursor = await conn.execute(
+                f"""
+                SELECT
+                    session_id,
+                    media_id,
+                    media_type,
+                    started_at,
+                    ended_at,
+                    is_active,
+                    play_duration_seconds,
+                    paused_duration_seconds,
+                    last_position_seconds,
+                    last_progress_update
+                FROM sessions
+                WHERE (started_at >= ? OR ended_at >= ? OR is_active = 1){filters}
+                """,
+                (since.isoformat(), since.isoformat(), *params),
+            )
+            rows = await cursor.fetchall()
+            # Unpack by position: this can return every session in the window, and
+            # name lookups on Row cost a string match per column per row
+            return [
+                {
+                    "session_id": session_id,
+                    "media_id": media_id,
+                    "media_type": media_type,
+                    "started_at": started_at,
+                    "ended_at": ended_at,
+                    "is_active": bool(is_active),
+                    "play_seconds": play_seconds or 0,
+                    "paused_seconds": paused_seconds or 0,
+                    "last_position_seconds": last_position or 0,
+                    "last_progress_update": last_progress_update,
+                }
+                for (
+                    session_id,
+                    media_id,
+                    media_type,
+                    started_at,
+                    ended_at,
+                    is_active,
+                    play_seconds,
+                    paused_seconds,
+                    last_position,
+                    last_progress_update,
+                ) in rows
+            ]
 
     async def get_daily_stats(
         self,
@@ -969,16 +1253,41 @@ class Database:
         media_type: Optional[str] = None,
     ) -> list[dict]:
         """Get daily usage statistics."""
-        since = datetime.now() - timedelta(days=days)
-        filters, params = self._build_filter_clause(user_id, device_name, media_type)
-        if self._include_aggregates(days):
-            cursor = await self.conn.execute(
-                f"""
-                SELECT
-                    date,
-                    SUM(session_count) as session_count,
-                    SUM(total_seconds) as total_seconds
-                FROM (
+        async with self.read() as conn:
+            since = datetime.now() - timedelta(days=days)
+            filters, params = self._build_filter_clause(user_id, device_name, media_type)
+            if self._include_aggregates(days):
+                cursor = await conn.execute(
+                    f"""
+                    SELECT
+                        date,
+                        SUM(session_count) as session_count,
+                        SUM(total_seconds) as total_seconds
+                    FROM (
+                        SELECT
+                            date(started_at) as date,
+                            COUNT(*) as session_count,
+                            SUM(play_duration_seconds) as total_seconds
+                        FROM sessions
+                        WHERE started_at >= ?{filters}
+                        GROUP BY date(started_at)
+                        UNION ALL
+                        SELECT
+                            date,
+                            SUM(session_count) as session_count,
+                            SUM(play_seconds) as total_seconds
+                        FROM session_aggregates
+                        WHERE date >= ?{filters}
+                        GROUP BY date
+                    )
+                    GROUP BY date
+                    ORDER BY date
+                    """,
+                    (since.isoformat(), *params, since.date().isoformat(), *params),
+                )
+            else:
+                cursor = await conn.execute(
+                    f"""
                     SELECT
                         date(started_at) as date,
                         COUNT(*) as session_count,
@@ -986,43 +1295,19 @@ class Database:
                     FROM sessions
                     WHERE started_at >= ?{filters}
                     GROUP BY date(started_at)
-                    UNION ALL
-                    SELECT
-                        date,
-                        SUM(session_count) as session_count,
-                        SUM(play_seconds) as total_seconds
-                    FROM session_aggregates
-                    WHERE date >= ?{filters}
-                    GROUP BY date
+                    ORDER BY date
+                    """,
+                    (since.isoformat(), *params),
                 )
-                GROUP BY date
-                ORDER BY date
-                """,
-                (since.isoformat(), *params, since.date().isoformat(), *params),
-            )
-        else:
-            cursor = await self.conn.execute(
-                f"""
-                SELECT
-                    date(started_at) as date,
-                    COUNT(*) as session_count,
-                    SUM(play_duration_seconds) as total_seconds
-                FROM sessions
-                WHERE started_at >= ?{filters}
-                GROUP BY date(started_at)
-                ORDER BY date
-                """,
-                (since.isoformat(), *params),
-            )
-        rows = await cursor.fetchall()
-        return [
-            {
-                "date": row["date"],
-                "session_count": row["session_count"],
-                "total_seconds": row["total_seconds"] or 0,
-            }
-            for row in rows
-        ]
+            rows = await cursor.fetchall()
+            return [
+                {
+                    "date": row["date"],
+                    "session_count": row["session_count"],
+                    "total_seconds": row["total_seconds"] or 0,
+                }
+                for row in rows
+            ]
 
     async def get_summary_stats(
         self,
@@ -1032,80 +1317,61 @@ class Database:
         media_type: Optional[str] = None,
     ) -> dict:
         """Get summary statistics."""
-        since = datetime.now() - timedelta(days=days)
-        filters, params = self._build_filter_clause(user_id, device_name, media_type)
-        if self._include_aggregates(days):
-            cursor = await self.conn.execute(
-                f"""
-                SELECT
-                    SUM(total_sessions) as total_sessions,
-                    SUM(total_seconds) as total_seconds
-                FROM (
-                    SELECT
-                        COUNT(*) as total_sessions,
-                        COALESCE(SUM(play_duration_seconds), 0) as total_seconds
-                    FROM sessions
-                    WHERE started_at >= ?{filters}
-                    UNION ALL
+        async with self.read() as conn:
+            since = datetime.now() - timedelta(days=days)
+            filters, params = self._build_filter_clause(user_id, device_name, media_type)
+            if self._include_aggregates(days):
+                # One pass over each table; COUNT(DISTINCT) across the UNION ALL
+                # matches the distinct counts of the two sources combined
+                cursor = await conn.execute(
+                    f"""
                     SELECT
-                        COALESCE(SUM(session_count), 0) as total_sessions,
-                        COALESCE(SUM(play_seconds), 0) as total_seconds
-                    FROM session_aggregates
-                    WHERE date >= ?{filters}
-                )
-                """,
-                (since.isoformat(), *params, since.date().isoformat(), *params),
-            )
-            row = await cursor.fetchone()
-            users_cursor = await self.conn.execute(
-                f"""
-                SELECT COUNT(DISTINCT user_id) as unique_users
-                FROM (
-                    SELECT user_id FROM sessions WHERE started_at >= ?{filters}
-                    UNION
-                    SELECT user_id FROM session_aggregates WHERE date >= ?{filters}
+                        SUM(session_count) as total_sessions,
+                        COUNT(DISTINCT user_id) as unique_users,
+                        COUNT(DISTINCT media_id) as unique_media,
+                        SUM(play_seconds) as total_seconds
+                    FROM (
+                        SELECT
+                            user_id,
+                            media_id,
+                            1 as session_count,
+                            play_duration_seconds as play_seconds
+                        FROM sessions
+                        WHERE started_at >= ?{filters}
+                        UNION ALL
+                        SELECT user_id, media_id, session_count, play_seconds
+                        FROM session_aggregates
+                        WHERE date >= ?{filters}
+                    )
+                    """,
+                    (since.isoformat(), *params, since.date().isoformat(), *params),
                 )
-                """,
-                (since.isoformat(), *params, since.date().isoformat(), *params),
-            )
-            users_row = await users_cursor.fetchone()
-            media_cursor = await self.conn.execute(
+                row = await cursor.fetchone()
+                return {
+                    "total_sessions": row["total_sessions"] or 0,
+                    "unique_users": row["unique_users"] or 0,
+                    "unique_media": row["unique_media"] or 0,
+                    "total_seconds": row["total_seconds"] or 0,
+                }
+            cursor = await conn.execute(
                 f"""
-                SELECT COUNT(DISTINCT media_id) as unique_media
-                FROM (
-                    SELECT media_id FROM sessions WHERE started_at >= ?{filters}
-                    UNION
-                    SELECT media_id FROM session_aggregates WHERE date >= ?{filters}
-                )
+                SELECT
+                    COUNT(*) as total_sessions,
+                    COUNT(DISTINCT user_id) as unique_users,
+                    COUNT(DISTINCT media_id) as unique_media,
+                    COALESCE(SUM(play_duration_seconds), 0) as total_seconds
+                FROM sessions
+                WHERE started_at >= ?{filters}
                 """,
-                (since.isoformat(), *params, since.date().isoformat(), *params),
+                (since.isoformat(), *params),
             )
-            media_row = await media_cursor.fetchone()
+            row = await cursor.fetchone()
             return {
-                "total_sessions": row["total_sessions"] or 0,
-                "unique_users": users_row["unique_users"] or 0,
-                "unique_media": media_row["unique_media"] or 0,
-                "total_seconds": row["total_seconds"] or 0,
+                "total_sessions": row["total_sessions"],
+                "unique_users": row["unique_users"],
+                "unique_media": row["unique_media"],
+                "total_seconds": row["total_seconds"],
             }
-        cursor = await self.conn.execute(
-            f"""
-            SELECT
-                COUNT(*) as total_sessions,
-                COUNT(DISTINCT user_id) as unique_users,
-                COUNT(DISTINCT media_id) as unique_media,
-                COALESCE(SUM(play_duration_seconds), 0) as total_seconds
-            FROM sessions
-            WHERE started_at >= ?{filters}
-            """,
-            (since.isoformat(), *params),
-        )
-        row = await cursor.fetchone()
-        return {
-            "total_sessions": row["total_sessions"],
-            "unique_users": row["unique_users"],
-            "unique_media": row["unique_media"],
-            "total_seconds": row["total_seconds"],
-        }
 
     async def get_media_type_stats(
         self,
@@ -1115,16 +1381,41 @@ class Database:
         media_type: Optional[str] = None,
     ) -> list[dict]:
         """Get statistics by media type."""
-        since = datetime.now() - timedelta(days=days)
-        filters, params = self._build_filter_clause(user_id, device_name, media_type)
-        if self._include_aggregates(days):
-            cursor = await self.conn.execute(
-                f"""
-                SELECT
-                    media_type,
-                    SUM(session_count) as session_count,
-                    SUM(total_seconds) as total_seconds
-                FROM (
+        async with self.read() as conn:
+            since = datetime.now() - timedelta(days=days)
+            filters, params = self._build_filter_clause(user_id, device_name, media_type)
+            if self._include_aggregates(days):
+                cursor = await conn.execute(
+                    f"""
+                    SELECT
+                        media_type,
+                        SUM(session_count) as session_count,
+                        SUM(total_seconds) as total_seconds
+                    FROM (
+                        SELECT
+                            media_type,
+                            COUNT(*) as session_count,
+                            SUM(play_duration_seconds) as total_seconds
+                        FROM sessions
+                        WHERE started_at >= ?{filters}
+                        GROUP BY media_type
+                        UNION ALL
+                        SELECT
+                            media_type,
+                            SUM(session_count) as session_count,
+                            SUM(play_seconds) as total_seconds
+                        FROM session_aggregates
+                        WHERE date >= ?{filters}
+                        GROUP BY media_type
+                    )
+                    GROUP BY media_type
+                    ORDER BY total_seconds DESC
+                    """,
+                    (since.isoformat(), *params, since.date().isoformat(), *params),
+                )
+            else:
+                cursor = await conn.execute(
+                    f"""
                     SELECT
                         media_type,
                         COUNT(*) as session_count,
@@ -1132,43 +1423,19 @@ class Database:
                     FROM sessions
                     WHERE started_at >= ?{filters}
                     GROUP BY media_type
-                    UNION ALL
-                    SELECT
-                        media_type,
-                        SUM(session_count) as session_count,
-                        SUM(play_seconds) as total_seconds
-                    FROM session_aggregates
-                    WHERE date >= ?{filters}
-                    GROUP BY media_type
+                    ORDER BY total_seconds DESC
+                    """,
+                    (since.isoformat(), *params),
                 )
-                GROUP BY media_type
-                ORDER BY total_seconds DESC
-                """,
-                (since.isoformat(), *params, since.date().isoformat(), *params),
-            )
-        else:
-            cursor = await self.conn.execute(
-                f"""
-                SELECT
-                    media_type,
-                    COUNT(*) as session_count,
-                    SUM(play_duration_seconds) as total_seconds
-                FROM sessions
-                WHERE started_at >= ?{filters}
-                GROUP BY media_type
-                ORDER BY total_seconds DESC
-                """,
-                (since.isoformat(), *params),
-            )
-        rows = await cursor.fetchall()
-        return [
-            {
-                "media_type": row["media_type"],
-                "session_count": row["session_count"],
-                "total_seconds": row["total_seconds"] or 0,
-            }
-            for row in rows
-        ]
+            rows = await cursor.fetchall()
+            return [
+                {
+                    "media_type": row["media_type"],
+                    "session_count": row["session_count"],
+                    "total_seconds": row["total_seconds"] or 0,
+                }
+                for row in rows
+            ]
 
     async def get_pause_stats(
         self,
@@ -1178,146 +1445,153 @@ class Database:
         media_type: Optional[str] = None,
     ) -> dict:
         """Get play vs pause totals."""
-        since = datetime.now() - timedelta(days=days)
-        filters, params = self._build_filter_clause(user_id, device_name, media_type)
-        if self._include_aggregates(days):
-            cursor = await self.conn.execute(
-                f"""
-                SELECT
-                    SUM(play_seconds) as play_seconds,
-                    SUM(paused_seconds) as paused_seconds
-                FROM (
+        async with self.read() as conn:
+            since = datetime.now() - timedelta(days=days)
+            filters, params = self._build_filter_clause(user_id, device_name, media_type)
+            if self._include_aggregates(days):
+                cursor = await conn.execute(
+                    f"""
+                    SELECT
+                        SUM(play_seconds) as play_seconds,
+                        SUM(paused_seconds) as paused_seconds
+                    FROM (
+                        SELECT
+                            COALESCE(SUM(play_duration_seconds), 0) as play_seconds,
+                            COALESCE(SUM(paused_duration_seconds), 0) as paused_seconds
+                        FROM sessions
+                        WHERE started_at >= ?{filters}
+                        UNION ALL
+                        SELECT
+                            COALESCE(SUM(play_seconds), 0) as play_seconds,
+                            COALESCE(SUM(paused_seconds), 0) as paused_seconds
+                        FROM session_aggregates
+                        WHERE date >= ?{filters}
+                    )
+                    """,
+                    (since.isoformat(), *params, since.date().isoformat(), *params),
+                )
+            else:
+                cursor = await conn.execute(
+                    f"""
                     SELECT
                         COALESCE(SUM(play_duration_seconds), 0) as play_seconds,
                         COALESCE(SUM(paused_duration_seconds), 0) as paused_seconds
                     FROM sessions
                     WHERE started_at >= ?{filters}
-                    UNION ALL
-                    SELECT
-                        COALESCE(SUM(play_seconds), 0) as play_seconds,
-                        COALESCE(SUM(paused_seconds), 0) as paused_seconds
-                    FROM session_aggregates
-                    WHERE date >= ?{filters}
+                    """,
+                    (since.isoformat(), *params),
                 )
-                """,
-                (since.isoformat(), *params, since.date().isoformat(), *params),
-            )
-        else:
-            cursor = await self.conn.execute(
-                f"""
-                SELECT
-                    COALESCE(SUM(play_duration_seconds), 0) as play_seconds,
-                    COALESCE(SUM(paused_duration_seconds), 0) as paused_seconds
-                FROM sessions
-                WHERE started_at >= ?{filters}
-                """,
-                (since.isoformat(), *params),
-            )
-        row = await cursor.fetchone()
-        return {
-            "play_seconds": row["play_seconds"] or 0,
-            "paused_seconds": row["paused_seconds"] or 0,
-        }
+            row = await cursor.fetchone()
+            return {
+                "play_seconds": row["play_seconds"] or 0,
+                "paused_seconds": row["paused_seconds"] or 0,
+            }
 
     async def get_filter_options(self, days: int = 30) -> dict:
         """Get filter options for users, devices, and media types."""
-        since = datetime.now() - timedelta(days=days)
-        exclusion_clause, exclusion_params = self._build_exclusion_clause()
-        user_filters = f" AND {exclusion_clause}" if exclusion_clause else ""
-        if self._include_aggregates(days):
-            users_cursor = await self.conn.execute(
-                f"""
-                SELECT user_id, user_name
-                FROM (
+        async with self.read() as conn:
+            since = datetime.now() - timedelta(days=days)
+            exclusion_clause, exclusion_params = self._build_exclusion_clause()
+            user_filters = f" AND {exclusion_clause}" if exclusion_clause else ""
+            if self._include_aggregates(days):
+                users_cursor = await conn.execute(
+                    f"""
+                    SELECT user_id, user_name
+                    FROM (
+                        SELECT user_id, user_name
+                        FROM sessions
+                        WHERE started_at >= ?{user_filters}
+                        GROUP BY user_id, user_name
+                        UNION
+                        SELECT user_id, user_name
+                        FROM session_aggregates
+                        WHERE date >= ?{user_filters}
+                        GROUP BY user_id, user_name
+                    )
+                    ORDER BY user_name
+                    """,
+                    (
+                        since.isoformat(),
+                        *exclusion_params,
+                        since.date().isoformat(),
+                        *exclusion_params,
+                    ),
+                )
+                devices_cursor = await conn.execute(
+                    """
+                    SELECT device_name
+                    FROM (
+                        SELECT device_name
+                        FROM sessions
+                        WHERE started_at >= ?
+                        GROUP BY device_name
+                        UNION
+                        SELECT device_name
+                        FROM session_aggregates
+                        WHERE date >= ?
+                        GROUP BY device_name
+                    )
+                    ORDER BY device_name
+                    """,
+                    (since.isoformat(), since.date().isoformat()),
+                )
+                types_cursor = await conn.execute(
+                    """
+                    SELECT media_type
+                    FROM (
+                        SELECT media_type
+                        FROM sessions
+                        WHERE started_at >= ?
+                        GROUP BY media_type
+                        UNION
+                        SELECT media_type
+                        FROM session_aggregates
+                        WHERE date >= ?
+                        GROUP BY media_type
+                    )
+                    ORDER BY media_type
+                    """,
+                    (since.isoformat(), since.date().isoformat()),
+                )
+            else:
+                users_cursor = await conn.execute(
+                    f"""
                     SELECT user_id, user_name
                     FROM sessions
                     WHERE started_at >= ?{user_filters}
                     GROUP BY user_id, user_name
-                    UNION
-                    SELECT user_id, user_name
-                    FROM session_aggregates
-                    WHERE date >= ?{user_filters}
-                    GROUP BY user_id, user_name
+                    ORDER BY user_name
+                    """,
+                    (since.isoformat(), *exclusion_params),
                 )
-                ORDER BY user_name
-                """,
-                (since.isoformat(), *exclusion_params, since.date().isoformat(), *exclusion_params),
-            )
-            devices_cursor = await self.conn.execute(
-                """
-                SELECT device_name
-                FROM (
+                devices_cursor = await conn.execute(
+                    """
                     SELECT device_name
                     FROM sessions
                     WHERE started_at >= ?
                     GROUP BY device_name
-                    UNION
-                    SELECT device_name
-                    FROM session_aggregates
-                    WHERE date >= ?
-                    GROUP BY device_name
+                    ORDER BY device_name
+                    """,
+                    (since.isoformat(),),
                 )
-                ORDER BY device_name
-                """,
-                (since.isoformat(), since.date().isoformat()),
-            )
-            types_cursor = await self.conn.execute(
-                """
-                SELECT media_type
-                FROM (
+                types_cursor = await conn.execute(
+                    """
                     SELECT media_type
                     FROM sessions
                     WHERE started_at >= ?
                     GROUP BY media_type
-                    UNION
-                    SELECT media_type
-                    FROM session_aggregates
-                    WHERE date >= ?
-                    GROUP BY media_type
+                    ORDER BY media_type
+                    """,
+                    (since.isoformat(),),
                 )
-                ORDER BY media_type
-                """,
-                (since.isoformat(), since.date().isoformat()),
-            )
-        else:
-            users_cursor = await self.conn.execute(
-                f"""
-                SELECT user_id, user_name
-                FROM sessions
-                WHERE started_at >= ?{user_filters}
-                GROUP BY user_id, user_name
-                ORDER BY user_name
-                """,
-                (since.isoformat(), *exclusion_params),
-            )
-            devices_cursor = await self.conn.execute(
-                """
-                SELECT device_name
-                FROM sessions
-                WHERE started_at >= ?
-                GROUP BY device_name
-                ORDER BY device_name
-                """,
-                (since.isoformat(),),
-            )
-            types_cursor = await self.conn.execute(
-                """
-                SELECT media_type
-                FROM sessions
-                WHERE started_at >= ?
-                GROUP BY media_type
-                ORDER BY media_type
-                """,
-                (since.isoformat(),),
-            )
-        users = await users_cursor.fetchall()
-        devices = await devices_cursor.fetchall()
-        types = await types_cursor.fetchall()
-        return {
-            "users": [{"id": row["user_id"], "name": row["user_name"]} for row in users],
-            "devices": [row["device_name"] for row in devices],
-            "media_types": [row["media_type"] for row in types],
-        }
+            users = await users_cursor.fetchall()
+            devices = await devices_cursor.fetchall()
+            types = await types_cursor.fetchall()
+            return {
+                "users": [{"id": row["user_id"], "name": row["user_name"]} for row in users],
+                "devices": [row["device_name"] for row in devices],
+                "media_types": [row["media_type"] for row in types],
+            }
 
     async def get_recent_activity(
         self,
@@ -1327,191 +1601,193 @@ class Database:
         media_type: Optional[str] = None,
     ) -> list[Session]:
         """Get recent playback activity."""
-        filters, params = self._build_filter_clause(user_id, device_name, media_type)
-        cursor = await self.conn.execute(
-            f"""
-            SELECT * FROM sessions
-            WHERE is_active = FALSE{filters}
-            ORDER BY started_at DESC
-            LIMIT ?
-            """,
-            (*params, limit),
-        )
-        rows = await cursor.fetchall()
-        return [self._row_to_session(row) for row in rows]
+        async with self.read() as conn:
+            filters, params = self._build_filter_clause(user_id, device_name, media_type)
+            cursor = await conn.execute(
+                f"""
+                SELECT * FROM sessions
+                WHERE is_active = 0{filters}
+                ORDER BY started_at DESC
+                LIMIT ?
+                """,
+                (*params, limit),
+            )
+            rows = await cursor.fetchall()
+            return [self._row_to_session(row) for row in rows]
 
     async def get_user_stats(self, user_id: str, days: int = 30) -> dict:
         """Get detailed statistics for a specific user."""
-        since = datetime.now() - timedelta(days=days)
+        async with self.read() as conn:
+            since = datetime.now() - timedelta(days=days)
 
-        if self._include_aggregates(days):
-            cursor = await self.conn.execute(
-                """
-                SELECT
-                    SUM(total_sessions) as total_sessions,
-                    SUM(total_seconds) as total_seconds
-                FROM (
-                    SELECT
-                        COUNT(*) as total_sessions,
-                        COALESCE(SUM(play_duration_seconds), 0) as total_seconds
-                    FROM sessions
-                    WHERE user_id = ? AND started_at >= ?
-                    UNION ALL
+            if self._include_aggregates(days):
+                cursor = await conn.execute(
+                    """
                     SELECT
-                        COALESCE(SUM(session_count), 0) as total_sessions,
-                        COALESCE(SUM(play_seconds), 0) as total_seconds
-                    FROM session_aggregates
-                    WHERE user_id = ? AND date >= ?
+                        SUM(total_sessions) as total_sessions,
+                        SUM(total_seconds) as total_seconds
+                    FROM (
+                        SELECT
+                            COUNT(*) as total_sessions,
+                            COALESCE(SUM(play_duration_seconds), 0) as total_seconds
+                        FROM sessions
+                        WHERE user_id = ? AND started_at >= ?
+                        UNION ALL
+                        SELECT
+                            COALESCE(SUM(session_count), 0) as total_sessions,
+                            COALESCE(SUM(play_seconds), 0) as total_seconds
+                        FROM session_aggregates
+                        WHERE user_id = ? AND date >= ?
+                    )
+                    """,
+                    (user_id, since.isoformat(), user_id, since.date().isoformat()),
                 )
-                """,
-                (user_id, since.isoformat(), user_id, since.date().isoformat()),
-            )
-            row = await cursor.fetchone()
-            name_cursor = await self.conn.execute(
-                """
-                SELECT user_name
-                FROM sessions
-                WHERE user_id = ? AND started_at >= ?
-                ORDER BY started_at DESC
-                LIMIT 1
-                """,
-                (user_id, since.isoformat()),
-            )
-            name_row = await name_cursor.fetchone()
-            if not name_row:
-                name_cursor = await self.conn.execute(
+                row = await cursor.fetchone()
+                name_cursor = await conn.execute(
                     """
                     SELECT user_name
-                    FROM session_aggregates
-                    WHERE user_id = ? AND date >= ?
-                    ORDER BY date DESC
+                    FROM sessions
+                    WHERE user_id = ? AND started_at >= ?
+                    ORDER BY started_at DESC
                     LIMIT 1
                     """,
-                    (user_id, since.date().isoformat()),
+                    (user_id, since.isoformat()),
                 )
                 name_row = await name_cursor.fetchone()
-            media_cursor = await self.conn.execute(
-                """
-                SELECT COUNT(DISTINCT media_id) as unique_media
-                FROM (
-                    SELECT media_id FROM sessions WHERE user_id = ? AND started_at >= ?
-                    UNION
-                    SELECT media_id FROM session_aggregates WHERE user_id = ? AND date >= ?
+                if not name_row:
+                    name_cursor = await conn.execute(
+                        """
+                        SELECT user_name
+                        FROM session_aggregates
+                        WHERE user_id = ? AND date >= ?
+                        ORDER BY date DESC
+                        LIMIT 1
+                        """,
+                        (user_id, since.date().isoformat()),
+                    )
+                    name_row = await name_cursor.fetchone()
+                media_cursor = await conn.execute(
+                    """
+                    SELECT COUNT(DISTINCT media_id) as unique_media
+                    FROM (
+                        SELECT media_id FROM sessions WHERE user_id = ? AND started_at >= ?
+                        UNION
+                        SELECT media_id FROM session_aggregates WHERE user_id = ? AND date >= ?
+                    )
+                    """,
+                    (user_id, since.isoformat(), user_id, since.date().isoformat()),
                 )
-                """,
-                (user_id, since.isoformat(), user_id, since.date().isoformat()),
-            )
-            media_row = await media_cursor.fetchone()
-            basic = {
-                "user_id": user_id,
-                "user_name": (name_row["user_name"] if name_row else "Unknown"),
-                "total_sessions": row["total_sessions"] or 0,
-                "total_seconds": row["total_seconds"] or 0,
-                "unique_media": media_row["unique_media"] or 0,
-            }
-        else:
-            # Basic stats
-            cursor = await self.conn.execute(
-                """
-                SELECT
-                    user_name,
-                    COUNT(*) as total_sessions,
-                    COALESCE(SUM(play_duration_seconds), 0) as total_seconds,
-                    COUNT(DISTINCT media_id) as unique_media
-                FROM sessions
-                WHERE user_id = ? AND started_at >= ?
-                """,
-                (user_id, since.isoformat()),
-            )
-            row = await cursor.fetchone()
-            basic = {
-                "user_id": user_id,
-                "user_name": row["user_name"] or "Unknown",
-                "total_sessions": row["total_sessions"],
-                "total_seconds": row["total_seconds"],
-                "unique_media": row["unique_media"],
-            }
+                media_row = await media_cursor.fetchone()
+                basic = {
+                    "user_id": user_id,
+                    "user_name": (name_row["user_name"] if name_row else "Unknown"),
+                    "total_sessions": row["total_sessions"] or 0,
+                    "total_seconds": row["total_seconds"] or 0,
+                    "unique_media": media_row["unique_media"] or 0,
+                }
+            else:
+                # Basic stats
+                cursor = await conn.execute(
+                    """
+                    SELECT
+                        user_name,
+                        COUNT(*) as total_sessions,
+                        COALESCE(SUM(play_duration_seconds), 0) as total_seconds,
+                        COUNT(DISTINCT media_id) as unique_media
+                    FROM sessions
+                    WHERE user_id = ? AND started_at >= ?
+                    """,
+                    (user_id, since.isoformat()),
+                )
+                row = await cursor.fetchone()
+                basic = {
+                    "user_id": user_id,
+                    "user_name": row["user_name"] or "Unknown",
+                    "total_sessions": row["total_sessions"],
+                    "total_seconds": row["total_seconds"],
+                    "unique_media": row["unique_media"],
+                }
 
-        if self._include_aggregates(days):
-            cursor = await self.conn.execute(
-                """
-                SELECT
-                    media_title,
-                    series_name,
-                    media_type,
-                    SUM(play_count) as play_count,
-                    SUM(total_seconds) as total_seconds
-                FROM (
+            if self._include_aggregates(days):
+                cursor = await conn.execute(
+                    """
                     SELECT
                         media_title,
                         series_name,
                         media_type,
-                        COUNT(*) as play_count,
-                        SUM(play_duration_seconds) as total_seconds
-                    FROM sessions
-                    WHERE user_id = ? AND started_at >= ?
-                    GROUP BY media_id, media_title, series_name, media_type
-                    UNION ALL
+                        SUM(play_count) as play_count,
+                        SUM(total_seconds) as total_seconds
+                    FROM (
+                        SELECT
+                            media_title,
+                            series_name,
+                            media_type,
+                            COUNT(*) as play_count,
+                            SUM(play_duration_seconds) as total_seconds
+                        FROM sessions
+                        WHERE user_id = ? AND started_at >= ?
+                        GROUP BY media_id, media_title, series_name, media_type
+                        UNION ALL
+                        SELECT
+                            media_title,
+                            series_name,
+                            media_type,
+                            SUM(session_count) as play_count,
+                            SUM(play_seconds) as total_seconds
+                        FROM session_aggregates
+                        WHERE user_id = ? AND date >= ?
+                        GROUP BY media_id, media_title, series_name, media_type
+                    )
+                    GROUP BY media_title, series_name, media_type
+                    ORDER BY total_seconds DESC
+                    LIMIT 10
+                    """,
+                    (user_id, since.isoformat(), user_id, since.date().isoformat()),
+                )
+            else:
+                # Top media for user
+                cursor = await conn.execute(
+                    """
                     SELECT
                         media_title,
                         series_name,
                         media_type,
-                        SUM(session_count) as play_count,
-                        SUM(play_seconds) as total_seconds
-                    FROM session_aggregates
-                    WHERE user_id = ? AND date >= ?
+                        COUNT(*) as play_count,
+                        SUM(play_duration_seconds) as total_seconds
+                    FROM sessions
+                    WHERE user_id = ? AND started_at >= ?
                     GROUP BY media_id, media_title, series_name, media_type
+                    ORDER BY total_seconds DESC
+                    LIMIT 10
+                    """,
+                    (user_id, since.isoformat()),
                 )
-                GROUP BY media_title, series_name, media_type
-                ORDER BY total_seconds DESC
-                LIMIT 10
-                """,
-                (user_id, since.isoformat(), user_id, since.date().isoformat()),
-            )
-        else:
-            # Top media for user
-            cursor = await self.conn.execute(
+            rows = await cursor.fetchall()
+            top_media = [
+                {
+                    "media_title": r["media_title"],
+                    "series_name": r["series_name"],
+                    "media_type": r["media_type"],
+                    "play_count": r["play_count"],
+                    "total_seconds": r["total_seconds"] or 0,
+                }
+                for r in rows
+            ]
+
+            # Recent activity for user
+            cursor = await conn.execute(
                 """
-                SELECT
-                    media_title,
-                    series_name,
-                    media_type,
-                    COUNT(*) as play_count,
-                    SUM(play_duration_seconds) as total_seconds
-                FROM sessions
-                WHERE user_id = ? AND started_at >= ?
-                GROUP BY media_id, media_title, series_name, media_type
-                ORDER BY total_seconds DESC
-                LIMIT 10
+                SELECT * FROM sessions
+                WHERE user_id = ?
+                ORDER BY started_at DESC
+                LIMIT 20
                 """,
-                (user_id, since.isoformat()),
+                (user_id,),
             )
-        rows = await cursor.fetchall()
-        top_media = [
-            {
-                "media_title": r["media_title"],
-                "series_name": r["series_name"],
-                "media_type": r["media_type"],
-                "play_count": r["play_count"],
-                "total_seconds": r["total_seconds"] or 0,
-            }
-            for r in rows
-        ]
-
-        # Recent activity for user
-        cursor = await self.conn.execute(
-            """
-            SELECT * FROM sessions
-            WHERE user_id = ?
-            ORDER BY started_at DESC
-            LIMIT 20
-            """,
-            (user_id,),
-        )
-        rows = await cursor.fetchall()
-        recent = [self._row_to_session(row) for row in rows]
+            rows = await cursor.fetchall()
+            recent = [self._row_to_session(row) for row in rows]
 
-        return {**basic, "top_media": top_media, "recent_activity": recent}
+            return {**basic, "top_media": top_media, "recent_activity": recent}
 
     def _row_to_session(self, row: aiosqlite.Row) -> Session:
         """Convert a database row to a Session model."""
@@ -1527,6 +1803,7 @@ class Database:
                 return fallback
 
         started_at = parse_dt(row["started_at"]) or datetime.fromtimestamp(0)
+        last_progress_update = parse_dt(row["last_progress_update"], started_at)
         return Session(
             id=row["id"],
             session_id=row["session_id"],
@@ -1549,7 +1826,8 @@ class Database:
             is_active=bool(row["is_active"]),
             last_position_seconds=row["last_position_seconds"] or 0,
             last_state_is_paused=bool(row["last_state_is_paused"]),
-            last_progress_update=parse_dt(row["last_progress_update"], started_at),
+            last_progress_update=last_progress_update,
+            last_progress_epoch=int(last_progress_update.timestamp()),
         )
 
 
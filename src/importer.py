@@ -1,8 +1,12 @@
+import asyncio
 import hashlib
 import logging
+import re
 from datetime import datetime
+from typing import AsyncIterator, Optional
 
 import httpx
+import ijson
 
 from .config import settings
 from .database import db
@@ -10,6 +14,17 @@ from .models import Session
 
 logger = logging.getLogger(__name__)
 
+# The Playback Reporting plugin has shipped both spellings of the columns key
+_COLUMN_PREFIXES = ("columns.item", "colums.item")
+
+_SERIES_RE = re.compile(
+    r"^(?P<series>.+?) - s(?P<season>\d+)e(?P<episode>\d+)(?: - (?P<title>.+))?$",
+    re.IGNORECASE,
+)
+
+# Sessions inserted per executemany/commit
+_IMPORT_BATCH_SIZE = 1000
+
 
 class PlaybackReportingImporter:
     """Import historical data from Jellyfin Playback Reporting plugin."""
@@ -17,6 +32,23 @@ class PlaybackReportingImporter:
     def __init__(self):
         self.base_url = settings.jellyfin_url
         self.api_key = settings.jellyfin_api_key
+        self._http: Optional[httpx.AsyncClient] = None
+
+    def _http_client(self) -> httpx.AsyncClient:
+        """Return the importer's HTTP client, creating it on first use."""
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                base_url=self.base_url,
+                http2=True,
+                limits=httpx.Limits(max_keepalive_connections=8, max_connections=16),
+            )
+        return self._http
+
+    async def aclose(self) -> None:
+        """Close the HTTP client."""
+        if self._http:
+            await self._http.aclose()
+            self._http = None
 
     async def import_all(self, days: int = 365) -> int:
         """Import all playback activity from the last N days."""
@@ -40,40 +72,45 @@ class PlaybackReportingImporter:
             ORDER BY DateCreated ASC
         """
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}/user_usage_stats/submit_custom_query",
+        # Look up user names while the query runs; both share one connection
+        users_task = asyncio.create_task(self._get_user_names())
+        try:
+            async with self._http_client().stream(
+                "POST",
+                "/user_usage_stats/submit_custom_query",
                 params={"api_key": self.api_key},
                 json={"CustomQueryString": query},
                 timeout=60.0,
-            )
-
-            if response.status_code != 200:
-                logger.error(f"Failed to query Playback Reporting: {response.status_code}")
-                return 0
-
-            data = response.json()
-
-        columns = data.get("columns") or data.get("colums") or []
-        results = data.get("results", [])
-
-        if not columns:
-            logger.error("Playback Reporting response missing columns")
-            return 0
-
-        if not results:
-            logger.info("No playback data found to import")
-            return 0
-
-        # Get user names mapping
-        user_names = await self._get_user_names()
-
+            ) as response:
+                if response.status_code != 200:
+                    logger.error(f"Failed to query Playback Reporting: {response.status_code}")
+                    return 0
+
+                return await self._import_rows(response, users_task)
+        finally:
+            # Don't wait on /Users when the query failed; gather() also collects
+            # any error it raised so it isn't reported as never retrieved
+            users_task.cancel()
+            await asyncio.gather(users_task, return_exceptions=True)
+
+    async def _import_rows(
+        self, response: httpx.Response, users_task: asyncio.Task[dict[str, str]]
+    ) -> int:
+        """Import result rows while the response body is still streaming."""
+        columns: list[str] = []
+        user_names: Optional[dict[str, str]] = None
         imported = 0
         skipped = 0
+        failed = 0
+        batch: list[Session] = []
 
-        for row in results:
+        async for row in self._iter_rows(response, columns):
             row_dict = dict(zip(columns, row))
 
+            # Wait for the user names mapping once the first row arrives
+            if user_names is None:
+                user_names = await users_task
+
             # Generate a stable session ID (prefer rowid when available)
             rowid = row_dict.get("rowid")
             if rowid:
@@ -83,12 +120,6 @@ class PlaybackReportingImporter:
                 digest = hashlib.sha1(fingerprint.encode("utf-8")).hexdigest()
                 session_id = f"imported_{digest}"
 
-            # Check if already imported
-            existing = await db.get_session_by_id(session_id)
-            if existing:
-                skipped += 1
-                continue
-
             # Parse the date
             date_str = row_dict.get("DateCreated", "")
             try:
@@ -106,27 +137,13 @@ class PlaybackReportingImporter:
             episode_number = None
             media_title = item_name
 
-            # Try to parse episode format: "Series - s01e02 - Episode Title"
-            if " - s" in item_name and "e" in item_name:
-                parts = item_name.split(" - ", 2)
-                if len(parts) >= 2:
-                    series_name = parts[0]
-                    season_ep = parts[1]
-                    if len(parts) >= 3:
-                        media_title = parts[2]
-                    else:
-                        media_title = item_name
-
-                    # Parse s01e02 format
-                    try:
-                        se_part = season_ep.lower()
-                        if se_part.startswith("s") and "e" in se_part:
-                            s_idx = se_part.index("s")
-                            e_idx = se_part.index("e")
-                            season_number = int(se_part[s_idx + 1 : e_idx])
-                            episode_number = int(se_part[e_idx + 1 :])
-                    except (ValueError, IndexError):
-                        pass
+            # Episode format: "Series - s01e02 - Episode Title" (title optional)
+            match = _SERIES_RE.match(item_name)
+            if match:
+                series_name = match["series"]
+                season_number = int(match["season"])
+                episode_number = int(match["episode"])
+                media_title = match["title"] or item_name
 
             user_id = row_dict.get("UserId", "")
             play_duration = int(row_dict.get("PlayDuration", 0))
@@ -155,37 +172,110 @@ class PlaybackReportingImporter:
                 last_progress_update=started_at,
             )
 
+            batch.append(session)
+            if len(batch) >= _IMPORT_BATCH_SIZE:
+                written, errors = await self._flush(batch)
+                imported += written
+                failed += errors
+                skipped += len(batch) - written - errors
+                batch = []
+
+        written, errors = await self._flush(batch)
+        imported += written
+        failed += errors
+        skipped += len(batch) - written - errors
+
+        if not columns:
+            logger.error("Playback Reporting response missing columns")
+            return 0
+
+        if imported == 0 and skipped == 0 and failed == 0:
+            logger.info("No playback data found to import")
+            return 0
+
+        logger.info(f"Import complete: {imported} imported, {skipped} skipped, {failed} failed")
+        return imported
+
+    async def _flush(self, batch: list[Session]) -> tuple[int, int]:
+        """Insert a batch of sessions, skipping ones already imported.
+
+        Returns (written, failed). A failing batch is retried row by row so one bad
+        row does not take the rest of the batch down with it.
+        """
+        if not batch:
+            return 0, 0
+        try:
+            return await db.bulk_create_sessions(batch, skip_existing=True), 0
+        except Exception as e:
+            logger.warning(f"Batch of {len(batch)} sessions failed, retrying one by one: {e}")
+
+        written = 0
+        failed = 0
+        for session in batch:
             try:
-                await db.create_session(session)
-                imported += 1
+                written += await db.bulk_create_sessions([session], skip_existing=True)
             except Exception as e:
-                logger.warning(f"Failed to import session: {e}")
-                skipped += 1
+                failed += 1
+                logger.warning(f"Failed to import session {session.session_id}: {e}")
+        return written, failed
 
-        logger.info(f"Import complete: {imported} imported, {skipped} skipped")
-        return imported
+    async def _iter_rows(self, response: httpx.Response, columns: list[str]) -> AsyncIterator[list]:
+        """Incrementally parse the query response, yielding one result row at a time.
+
+        Column names are appended to ``columns`` as they are parsed. Rows that arrive
+        before the column list are held back until it is known.
+        """
+        events = ijson.sendable_list()
+        parser = ijson.parse_coro(events, use_float=True)
+        pending: list[list] = []
+        row: list = []
+        done = False
+        chunks = response.aiter_bytes()
+        while not done:
+            chunk = await anext(chunks, None)
+            if chunk is None:
+                parser.close()
+                done = True
+            elif chunk:
+                parser.send(chunk)
+            for prefix, event, value in events:
+                if prefix in _COLUMN_PREFIXES:
+                    columns.append(value)
+                elif prefix == "results.item.item":
+                    row.append(value)
+                elif prefix == "results.item" and event == "end_array":
+                    if columns:
+                        yield row
+                    else:
+                        pending.append(row)
+                    row = []
+            del events[:]
+        if columns:
+            for row in pending:
+                yield row
 
     async def _get_user_names(self) -> dict[str, str]:
         """Get mapping of user IDs to names."""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/Users",
-                params={"api_key": self.api_key},
-                timeout=30.0,
-            )
+        response = await self._http_client().get(
+            "/Users", params={"api_key": self.api_key}, timeout=30.0
+        )
 
-            if response.status_code != 200:
-                return {}
+        if response.status_code != 200:
+            return {}
 
-            users = response.json()
-            return {u["Id"]: u["Name"] for u in users}
+        users = response.json()
+        return {u["Id"]: u["Name"] for u in users}
 
 
 async def run_import(days: int = 365) -> int:
     """Run the import process."""
     await db.connect()
+    importer = PlaybackReportingImporter()
     try:
-        importer = PlaybackReportingImporter()
-        return await importer.import_all(days=days)
+        imported = await importer.import_all(days=days)
+        if imported > 0:
+            await db.optimize()
+        return imported
     finally:
+        await importer.aclose()
         await db.close()
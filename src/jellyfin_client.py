@@ -1,29 +1,102 @@
 import asyncio
-import json
+import heapq
 import logging
+import random
+import socket
+import time
 import uuid
 from datetime import datetime
 from typing import Awaitable, Callable, Optional
 
 import httpx
+import orjson
 import websockets
 
 from .config import settings
-from .database import db
+from .database import SessionStateUpdate, db
 from .models import PlaybackEvent, Session
 
 logger = logging.getLogger(__name__)
 
+# Jellyfin payload keys read on every Sessions tick
+_K_ID = "Id"
+_K_USER_ID = "UserId"
+_K_USER_NAME = "UserName"
+_K_DEVICE_ID = "DeviceId"
+_K_DEVICE_NAME = "DeviceName"
+_K_CLIENT = "Client"
+_K_NAME = "Name"
+_K_TYPE = "Type"
+_K_SERIES_NAME = "SeriesName"
+_K_SEASON = "ParentIndexNumber"
+_K_EPISODE = "IndexNumber"
+_K_NOW_PLAYING = "NowPlayingItem"
+_K_PLAY_STATE = "PlayState"
+_K_POSITION_TICKS = "PositionTicks"
+_K_IS_PAUSED = "IsPaused"
+
+# Sessions payloads routinely exceed 100KB; fewer recv() calls per frame
+_RCVBUF_BYTES = 1 << 20
+
+_SUBSCRIBE_FRAME: bytes = orjson.dumps({"MessageType": "SessionsStart", "Data": "0,2000"})
+
+# Unchanged sessions are still written this often so last_progress_update stays fresh
+_FORCED_WRITE_NS = 60 * 1_000_000_000
+
+
+def _calc_deltas(
+    elapsed: int, last_position: int, position: int, was_paused: bool
+) -> tuple[int, int]:
+    """Return (play_add, paused_add) seconds from plain ints; no attribute or clock access."""
+    # Cap elapsed to avoid huge jumps from stale data
+    if elapsed < 0:
+        elapsed = 0
+    elif elapsed > 300:
+        elapsed = 300
+
+    # Pause time: if was paused, add elapsed time
+    if was_paused:
+        return 0, elapsed
+
+    # Play time: use position delta (more accurate than elapsed time),
+    # capped to avoid huge jumps from seeking (small tolerance allowed)
+    play_add = position - last_position
+    if play_add < 0:
+        play_add = 0
+    elif play_add > elapsed + 10:
+        play_add = elapsed + 10
+    return play_add, 0
+
 
 class JellyfinWebSocketClient:
     def __init__(self):
-        self.ws: Optional[websockets.WebSocketClientProtocol] = None
+        self.ws: Optional[websockets.ClientConnection] = None
         self._running = False
-        self._reconnect_delay = 1
+        self._reconnect_delay = 0
         self._max_reconnect_delay = 60
         self._on_session_update: Optional[Callable[[], Awaitable[None]]] = None
         self._connected = False
         self._last_message_at: Optional[datetime] = None
+        # Formatted once per batch so status() polling never re-formats it
+        self._last_message_at_iso: Optional[str] = None
+        self._notify_debounce_ms = 250
+        self._pending_notify: Optional[asyncio.Task] = None
+        self._http: Optional[httpx.AsyncClient] = None
+        # Min-heap of (monotonic_ns deadline, session_id); entries are re-pushed
+        # lazily when _timeout_deadlines shows the deadline has moved on
+        self._timeout_heap: list[tuple[int, str]] = []
+        self._timeout_deadlines: dict[str, int] = {}
+        self._timeout_wakeup = asyncio.Event()
+        # Active sessions by session_id, loaded from the database on first use and
+        # kept in step with every write; None means it must be (re)loaded
+        self._active_cache: Optional[dict[str, Session]] = None
+        # (position_ticks, is_paused) last written for each tracked session
+        self._last_fingerprint: dict[str, tuple[int, bool]] = {}
+        # Progress not yet written to the database, merged per session and flushed
+        # every flush_interval_seconds or as soon as a session changes state
+        self._dirty: dict[str, SessionStateUpdate] = {}
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
 
     def set_session_update_callback(self, callback: Callable[[], Awaitable[None]]) -> None:
         """Set callback to be called when sessions are updated."""
@@ -32,37 +105,54 @@ class JellyfinWebSocketClient:
     async def start(self) -> None:
         """Start the WebSocket client with auto-reconnect."""
         self._running = True
+        self._flush_task = asyncio.create_task(self._flush_loop())
         while self._running:
             try:
                 await self._connect()
             except Exception as e:
                 logger.error(f"WebSocket error: {e}")
                 if self._running:
-                    await asyncio.sleep(self._reconnect_delay)
+                    # First retry is immediate; later ones back off exponentially with
+                    # jitter so several instances don't reconnect in lockstep
+                    await asyncio.sleep(self._reconnect_delay * (0.5 + random.random()))
                     self._reconnect_delay = min(
-                        self._reconnect_delay * 2, self._max_reconnect_delay
+                        max(1, self._reconnect_delay * 2), self._max_reconnect_delay
                     )
 
     async def stop(self) -> None:
         """Stop the WebSocket client."""
         self._running = False
+        if self._pending_notify:
+            self._pending_notify.cancel()
+        if self._flush_task:
+            self._flush_task.cancel()
+            self._flush_task = None
+        try:
+            await self._flush_dirty()
+        except Exception as e:
+            logger.error(f"Error flushing session progress: {e}")
         if self.ws:
             await self.ws.close()
+        if self._http:
+            await self._http.aclose()
+            self._http = None
 
     async def _connect(self) -> None:
         """Connect to Jellyfin WebSocket and listen for events."""
         ws_url = settings.jellyfin_ws_url
         logger.info(f"Connecting to Jellyfin WebSocket: {ws_url.split('?')[0]}...")
 
-        # Increase max_size to handle large session payloads from Jellyfin (default is 1MB)
-        async with websockets.connect(ws_url, max_size=16 * 1024 * 1024) as ws:
+        # Increase max_size to handle large session payloads from Jellyfin (default is 1MB).
+        # Deflate is off: on a LAN link its CPU cost outweighs the bandwidth saved.
+        async with websockets.connect(ws_url, max_size=16 * 1024 * 1024, compression=None) as ws:
             self.ws = ws
-            self._reconnect_delay = 1
+            self._tune_socket(ws)
             self._connected = True
             logger.info("Connected to Jellyfin WebSocket")
 
-            # Subscribe to session updates (every 2 seconds)
-            await ws.send(json.dumps({"MessageType": "SessionsStart", "Data": "0,2000"}))
+            # Subscribe to session updates (every 2 seconds), sent as a text frame
+            await ws.send(_SUBSCRIBE_FRAME, text=True)
+            self._reconnect_delay = 0
             logger.info("Subscribed to session updates")
 
             # Start timeout checker before refresh to avoid race condition
@@ -71,8 +161,12 @@ class JellyfinWebSocketClient:
             try:
                 await self._refresh_sessions()
 
-                async for message in ws:
-                    await self._handle_message(message)
+                while True:
+                    try:
+                        frames = await self._recv_batch(ws)
+                    except websockets.ConnectionClosedOK:
+                        break
+                    await self._handle_messages(frames)
             finally:
                 self._connected = False
                 timeout_task.cancel()
@@ -81,93 +175,384 @@ class JellyfinWebSocketClient:
                 except asyncio.CancelledError:
                     pass
 
+    def _tune_socket(self, ws: websockets.ClientConnection) -> None:
+        """Disable Nagle and enlarge the receive buffer for large Sessions payloads."""
+        sock = ws.transport.get_extra_info("socket")
+        if sock is None:
+            return
+        try:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, _RCVBUF_BYTES)
+        except OSError as e:
+            logger.warning(f"Could not tune WebSocket socket: {e}")
+
+    async def _recv_batch(self, ws: websockets.ClientConnection) -> list[bytes]:
+        """Wait for one frame, then drain every frame already buffered behind it."""
+        # Raw bytes: orjson parses them directly, skipping the UTF-8 decode
+        frames = [await ws.recv(decode=False)]
+        while True:
+            try:
+                # recv() is cancellation-safe, so a zero timeout never drops a frame
+                async with asyncio.timeout(0):
+                    frames.append(await ws.recv(decode=False))
+            except (TimeoutError, websockets.ConnectionClosed):
+                # A close mid-drain surfaces on the next blocking recv()
+                return frames
+
     async def _check_timeouts(self) -> None:
-        """Periodically check for timed out sessions."""
+        """Time out sessions as their deadlines expire."""
+        # Catch anything that went stale while we were disconnected
+        try:
+            # Land pending progress first: the sweep reads last_progress_update, and the
+            # cache is reloaded from the database afterwards
+            await self._flush_dirty()
+            count = await db.timeout_stale_sessions(settings.session_timeout_minutes)
+            if count > 0:
+                logger.info(f"Timed out {count} stale session(s)")
+                self._active_cache = None
+                self._schedule_notify()
+        except Exception as e:
+            logger.error(f"Error checking timeouts: {e}")
+
         while True:
-            await asyncio.sleep(60)
+            if not self._timeout_heap:
+                self._timeout_wakeup.clear()
+                await self._timeout_wakeup.wait()
+                continue
+
+            deadline, session_id = self._timeout_heap[0]
+            delay_ns = deadline - time.monotonic_ns()
+            if delay_ns > 0:
+                await asyncio.sleep(delay_ns / 1_000_000_000)
+                continue
+
+            heapq.heappop(self._timeout_heap)
+            current = self._timeout_deadlines.get(session_id)
+            if current is None:
+                continue
+            if current > deadline:
+                heapq.heappush(self._timeout_heap, (current, session_id))
+                continue
+            self._forget_session(session_id)
+
             try:
-                count = await db.timeout_stale_sessions(settings.session_timeout_minutes)
-                if count > 0:
-                    logger.info(f"Timed out {count} stale session(s)")
-                    if self._on_session_update:
-                        await self._on_session_update()
+                # ended_at comes from last_progress_update, so land pending progress first
+                await self._flush_dirty()
+                if await db.timeout_session(session_id):
+                    logger.info(f"Timed out stale session {session_id}")
+                    self._schedule_notify()
             except Exception as e:
                 logger.error(f"Error checking timeouts: {e}")
 
-    async def _handle_message(self, message: str) -> None:
-        """Handle incoming WebSocket message."""
+    def _record_progress(
+        self,
+        session_id: str,
+        now_ns: int,
+        fingerprint: Optional[tuple[int, bool]] = None,
+    ) -> None:
+        """Remember when and with what state a session's progress was last written."""
+        if self._active_cache is not None and session_id in self._active_cache:
+            self._active_cache[session_id].last_progress_monotonic_ns = now_ns
+        if fingerprint is None:
+            self._last_fingerprint.pop(session_id, None)
+        else:
+            self._last_fingerprint[session_id] = fingerprint
+        self._track_timeout(session_id, now_ns)
+
+    def _track_timeout(self, session_id: str, now_ns: int) -> None:
+        """Push back a session's timeout deadline after fresh activity."""
+        deadline = now_ns + settings.session_timeout_minutes * 60 * 1_000_000_000
+        if session_id not in self._timeout_deadlines:
+            heapq.heappush(self._timeout_heap, (deadline, session_id))
+            self._timeout_wakeup.set()
+        self._timeout_deadlines[session_id] = deadline
+
+    def _forget_session(self, session_id: str) -> None:
+        """Drop all in-memory tracking for a session once it has ended."""
+        self._timeout_deadlines.pop(session_id, None)
+        self._last_fingerprint.pop(session_id, None)
+        if self._active_cache is not None:
+            self._active_cache.pop(session_id, None)
+
+    async def _active_sessions(self) -> dict[str, Session]:
+        """Return the active-session cache, loading it from the database if needed."""
+        if self._active_cache is None:
+            # Pending deltas were computed against the cached state; write them before
+            # reloading so they are not recomputed from stale rows and counted twice
+            if self._dirty:
+                await self._flush_dirty()
+            sessions = await db.get_active_sessions(exclude_users=False)
+            self._active_cache = {s.session_id: s for s in sessions}
+        return self._active_cache
+
+    async def _find_active(self, jellyfin_session_id: str) -> Optional[Session]:
+        """Look up an active session by Jellyfin session id (or our own id)."""
+        active = await self._active_sessions()
+        for session in active.values():
+            if session.jellyfin_session_id == jellyfin_session_id:
+                return session
+        return active.get(jellyfin_session_id)
+
+    def _apply_update(self, update: SessionStateUpdate, now_epoch: int) -> None:
+        """Mirror a written state update onto the cached session."""
+        session_id, position, paused, play_add, paused_add, now = update
+        session = self._active_cache.get(session_id) if self._active_cache else None
+        if session is None:
+            return
+        session.play_duration_seconds += play_add
+        session.paused_duration_seconds += paused_add
+        session.last_position_seconds = position
+        session.last_state_is_paused = paused
+        session.last_progress_update = now
+        session.last_progress_epoch = now_epoch
+
+    def _mark_dirty(self, update: SessionStateUpdate) -> None:
+        """Queue a state update, folding it into any still-unwritten one."""
+        session_id, position, paused, play_add, paused_add, now = update
+        pending = self._dirty.get(session_id)
+        if pending is not None:
+            play_add += pending[3]
+            paused_add += pending[4]
+        self._dirty[session_id] = (session_id, position, paused, play_add, paused_add, now)
+
+    def _requeue_dirty(self, update: SessionStateUpdate) -> None:
+        """Put back an unwritten update without overwriting newer state."""
+        pending = self._dirty.get(update[0])
+        if pending is None:
+            self._dirty[update[0]] = update
+            return
+        # The pending entry was queued later, so its position, pause state and
+        # timestamp win; only the failed update's deltas are carried over
+        session_id, position, paused, play_add, paused_add, now = pending
+        self._dirty[session_id] = (
+            session_id,
+            position,
+            paused,
+            play_add + update[3],
+            paused_add + update[4],
+            now,
+        )
+
+    def _take_dirty(self) -> list[SessionStateUpdate]:
+        """Remove and return every pending state update."""
+        updates = list(self._dirty.values())
+        self._dirty.clear()
+        return updates
+
+    async def _flush_dirty(self) -> int:
+        """Write all pending state updates in one batch."""
+        async with self._flush_lock:
+            updates = self._take_dirty()
+            try:
+                await db.bulk_update_session_state(updates)
+            except Exception:
+                # Nothing was committed; keep the deltas for the next flush
+                for update in updates:
+                    self._requeue_dirty(update)
+                raise
+        return len(updates)
+
+    async def _flush_loop(self) -> None:
+        """Periodically write coalesced session progress."""
+        while True:
+            await asyncio.sleep(settings.flush_interval_seconds)
+            try:
+                if await self._flush_dirty():
+                    self._schedule_notify()
+            except Exception as e:
+                logger.error(f"Error flushing session progress: {e}")
+
+    def _schedule_notify(self) -> None:
+        """Schedule the update callback, coalescing bursts into one trailing call."""
+        if not self._on_session_update:
+            return
+        if self._pending_notify and not self._pending_notify.done():
+            self._pending_notify.cancel()
+        self._pending_notify = asyncio.create_task(self._debounced_notify())
+
+    async def _debounced_notify(self) -> None:
+        """Wait out the debounce window, then invoke the update callback."""
+        await asyncio.sleep(self._notify_debounce_ms / 1000)
+        # Detach before running so a new burst schedules rather than cancels us
+        self._pending_notify = None
         try:
-            data = json.loads(message)
-            self._last_message_at = datetime.now()
-            message_type = data.get("MessageType", "")
-
-            if message_type == "Sessions":
-                await self._handle_sessions(data.get("Data", []))
-            elif message_type == "PlaybackStart":
-                await self._handle_playback_start(data.get("Data", {}))
-            elif message_type == "PlaybackStopped":
-                await self._handle_playback_stop(data.get("Data", {}))
-            elif message_type == "PlaybackProgress":
-                # Jellyfin doesn't send dedicated progress messages over WS
-                # Progress is included in Sessions updates
-                pass
-
-        except json.JSONDecodeError:
-            logger.warning(f"Invalid JSON message: {message[:100]}")
+            await self._on_session_update()
         except Exception as e:
-            logger.error(f"Error handling message: {e}")
+            logger.error(f"Error in session update callback: {e}")
+
+    async def _handle_message(self, message: str | bytes) -> None:
+        """Handle incoming WebSocket message."""
+        await self._handle_messages([message])
+
+    async def _handle_messages(self, messages: list[str | bytes]) -> None:
+        """Parse a batch of WebSocket frames, then dispatch them in order."""
+        parsed = []
+        for message in messages:
+            try:
+                data = orjson.loads(message)
+            except orjson.JSONDecodeError:
+                logger.warning(f"Invalid JSON message: {message[:100]}")
+                continue
+            if not isinstance(data, dict):
+                logger.warning(f"Unexpected non-object message: {message[:100]}")
+                continue
+            parsed.append(data)
+        if not parsed:
+            return
+        self._last_message_at = datetime.now()
+        self._last_message_at_iso = self._last_message_at.isoformat()
+
+        # Sessions frames are full snapshots: only the newest in a batch matters.
+        # It keeps its place relative to playback events so ordering is preserved.
+        latest_sessions = None
+        for index, data in enumerate(parsed):
+            if data.get("MessageType") == "Sessions":
+                latest_sessions = index
+
+        for index, data in enumerate(parsed):
+            if data.get("MessageType") == "Sessions" and index != latest_sessions:
+                continue
+            try:
+                await self._dispatch(data)
+            except Exception as e:
+                logger.error(f"Error handling message: {e}")
+
+    async def _dispatch(self, data: dict) -> None:
+        """Route one parsed message to its handler."""
+        message_type = data.get("MessageType", "")
+
+        if message_type == "Sessions":
+            await self._handle_sessions(data.get("Data", []))
+        elif message_type == "PlaybackStart":
+            await self._handle_playback_start(data.get("Data", {}))
+        elif message_type == "PlaybackStopped":
+            await self._handle_playback_stop(data.get("Data", {}))
+        elif message_type == "PlaybackProgress":
+            # Jellyfin doesn't send dedicated progress messages over WS
+            # Progress is included in Sessions updates
+            pass
 
     async def _handle_sessions(self, sessions: list[dict]) -> None:
         """Handle Sessions update message - track active playback."""
         active_session_ids = set()
+        # One clock snapshot per tick: wall clock for persisted columns,
+        # monotonic for elapsed-time deltas
         now = datetime.now()
+        now_ns = time.monotonic_ns()
+
+        # Lookups come from the in-memory cache; the database is only read to seed it
+        active = await self._active_sessions()
+        active_db_sessions = list(active.values())
+        active_by_jellyfin_id = {s.jellyfin_session_id: s for s in active_db_sessions}
+        updates: list[SessionStateUpdate] = []
+        ends: list[str] = []
+        creates: list[Session] = []
+        written: list[tuple[str, tuple[int, bool]]] = []
+        unchanged: list[str] = []
+        transitioned = False
 
         for session_data in sessions:
-            now_playing = session_data.get("NowPlayingItem")
+            sd_get = session_data.get
+            now_playing = sd_get(_K_NOW_PLAYING)
             if not now_playing:
                 continue
 
-            jellyfin_session_id = session_data.get("Id", "")
+            jellyfin_session_id = sd_get(_K_ID, "")
             if not jellyfin_session_id:
                 continue
             active_session_ids.add(jellyfin_session_id)
 
-            play_state = session_data.get("PlayState", {})
-            position_ticks = play_state.get("PositionTicks") or 0
-            is_paused = bool(play_state.get("IsPaused", False))
+            play_state = sd_get(_K_PLAY_STATE) or {}
+            position_ticks = play_state.get(_K_POSITION_TICKS) or 0
+            is_paused = bool(play_state.get(_K_IS_PAUSED, False))
 
             # Calculate duration in seconds
             duration_seconds = position_ticks // 10_000_000
+            fingerprint = (position_ticks, is_paused)
 
             # Check if this is a new session or item
-            existing = await db.get_active_session_by_jellyfin_id(jellyfin_session_id)
-            if not existing:
-                existing = await db.get_active_session(jellyfin_session_id)
+            existing = active_by_jellyfin_id.get(jellyfin_session_id) or active.get(
+                jellyfin_session_id
+            )
             event = self._extract_playback_event(session_data, now_playing)
             if existing and existing.media_id != event.item_id:
-                await self._finalize_session(existing, now)
-                await db.end_session(existing.session_id)
+                updates.append(self._finalize_update(existing, now, now_monotonic_ns=now_ns))
+                ends.append(existing.session_id)
                 existing = None
             if not existing:
-                await self._create_session(event, duration_seconds, is_paused)
+                session = self._build_session(event, duration_seconds, is_paused, now)
+                creates.append(session)
+                written.append((session.session_id, fingerprint))
+            elif (
+                self._last_fingerprint.get(existing.session_id) == fingerprint
+                and existing.last_progress_monotonic_ns is not None
+                and now_ns - existing.last_progress_monotonic_ns < _FORCED_WRITE_NS
+            ):
+                # Nothing moved since the last write; deltas catch up on the next one
+                unchanged.append(existing.session_id)
             else:
+                transitioned = transitioned or is_paused != existing.last_state_is_paused
                 play_add, paused_add = self._calculate_deltas(
-                    existing, duration_seconds, is_paused, now
+                    existing, duration_seconds, is_paused, now, now_ns
                 )
-                await db.update_session_state(
-                    existing.session_id, duration_seconds, is_paused, play_add, paused_add, now
+                updates.append(
+                    (existing.session_id, duration_seconds, is_paused, play_add, paused_add, now)
                 )
+                written.append((existing.session_id, fingerprint))
 
         # Check for ended sessions (not in active list anymore)
-        active_db_sessions = await db.get_active_sessions()
-        for db_session in active_db_sessions:
-            if db_session.jellyfin_session_id not in active_session_ids:
-                await self._finalize_session(db_session, now)
-                await db.end_session(db_session.session_id)
-                logger.info(f"Session ended: {db_session.user_name} - {db_session.media_title}")
-
-        if self._on_session_update:
-            await self._on_session_update()
+        ended_sessions = [
+            s for s in active_db_sessions if s.jellyfin_session_id not in active_session_ids
+        ]
+        for db_session in ended_sessions:
+            updates.append(self._finalize_update(db_session, now, now_monotonic_ns=now_ns))
+            ends.append(db_session.session_id)
+
+        now_epoch = int(now.timestamp())
+        for update in updates:
+            self._mark_dirty(update)
+            self._apply_update(update, now_epoch)
+
+        # Plain progress waits for the flush loop; starts, ends and pause toggles are
+        # written now. Pending updates land before the rows they touch are ended,
+        # and new rows after the old ones are closed.
+        flushed = bool(ends or creates or transitioned)
+        if flushed:
+            async with self._flush_lock:
+                try:
+                    await db.bulk_update_session_state(self._take_dirty())
+                    await db.bulk_end_sessions(ends)
+                    await db.bulk_create_sessions(creates)
+                except Exception:
+                    # Some batches may have landed; reload from the database next tick
+                    # and drop anything pending, which the reload supersedes
+                    self._dirty.clear()
+                    self._active_cache = None
+                    raise
+
+        for session_id in ends:
+            self._forget_session(session_id)
+        for session in creates:
+            active[session.session_id] = session
+        for session_id, fingerprint in written:
+            self._record_progress(session_id, now_ns, fingerprint)
+        for session_id in unchanged:
+            self._track_timeout(session_id, now_ns)
+
+        # Per-session lines are skipped entirely when INFO is off
+        if logger.isEnabledFor(logging.INFO):
+            for session in creates:
+                logger.info(
+                    "Session started: %s - %s on %s",
+                    session.user_name,
+                    session.media_title,
+                    session.device_name,
+                )
+            for db_session in ended_sessions:
+                logger.info("Session ended: %s - %s", db_session.user_name, db_session.media_title)
+
+        if flushed:
+            self._schedule_notify()
 
     async def _handle_playback_start(self, data: dict) -> None:
         """Handle PlaybackStart event."""
@@ -190,12 +575,14 @@ class JellyfinWebSocketClient:
         }
 
         event = self._extract_playback_event(session_data, now_playing)
-        existing = await db.get_active_session_by_jellyfin_id(session_id)
-        if not existing:
-            existing = await db.get_active_session(session_id)
+        existing = await self._find_active(session_id)
         if existing and existing.media_id != event.item_id:
-            await self._finalize_session(existing, datetime.now())
+            await self._flush_dirty()
+            await self._finalize_session(
+                existing, datetime.now(), now_monotonic_ns=time.monotonic_ns()
+            )
             await db.end_session(existing.session_id)
+            self._forget_session(existing.session_id)
             existing = None
         if not existing:
             await self._create_session(event, 0, False)
@@ -210,41 +597,65 @@ class JellyfinWebSocketClient:
         position_ticks = play_state.get("PositionTicks") or 0
         duration_seconds = position_ticks // 10_000_000
         is_paused = bool(play_state.get("IsPaused", False))
-        existing = await db.get_active_session_by_jellyfin_id(session_id)
-        if not existing:
-            existing = await db.get_active_session(session_id)
+        existing = await self._find_active(session_id)
         if existing:
-            await self._finalize_session(existing, datetime.now(), duration_seconds, is_paused)
+            await self._flush_dirty()
+            await self._finalize_session(
+                existing,
+                datetime.now(),
+                duration_seconds,
+                is_paused,
+                now_monotonic_ns=time.monotonic_ns(),
+            )
             await db.end_session(existing.session_id)
+            self._forget_session(existing.session_id)
 
-        logger.info(f"Playback stopped for session {session_id}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Playback stopped for session %s", session_id)
 
-        if self._on_session_update:
-            await self._on_session_update()
+        self._schedule_notify()
 
     def _extract_playback_event(self, session_data: dict, now_playing: dict) -> PlaybackEvent:
         """Extract a PlaybackEvent from session and item data."""
+        s_get = session_data.get
+        np_get = now_playing.get
         return PlaybackEvent(
-            session_id=session_data.get("Id", ""),
-            user_id=session_data.get("UserId", ""),
-            user_name=session_data.get("UserName", "Unknown"),
-            device_id=session_data.get("DeviceId", ""),
-            device_name=session_data.get("DeviceName", "Unknown"),
-            client_name=session_data.get("Client", "Unknown"),
-            item_id=now_playing.get("Id", ""),
-            item_name=now_playing.get("Name", "Unknown"),
-            item_type=now_playing.get("Type", "Unknown"),
-            series_name=now_playing.get("SeriesName"),
-            season_number=now_playing.get("ParentIndexNumber"),
-            episode_number=now_playing.get("IndexNumber"),
+            session_id=s_get(_K_ID, ""),
+            user_id=s_get(_K_USER_ID, ""),
+            user_name=s_get(_K_USER_NAME, "Unknown"),
+            device_id=s_get(_K_DEVICE_ID, ""),
+            device_name=s_get(_K_DEVICE_NAME, "Unknown"),
+            client_name=s_get(_K_CLIENT, "Unknown"),
+            item_id=np_get(_K_ID, ""),
+            item_name=np_get(_K_NAME, "Unknown"),
+            item_type=np_get(_K_TYPE, "Unknown"),
+            series_name=np_get(_K_SERIES_NAME),
+            season_number=np_get(_K_SEASON),
+            episode_number=np_get(_K_EPISODE),
         )
 
     async def _create_session(
         self, event: PlaybackEvent, position_seconds: int, is_paused: bool
     ) -> None:
         """Create a new session from a playback event."""
-        now = datetime.now()
-        session = Session(
+        session = self._build_session(event, position_seconds, is_paused, datetime.now())
+        await db.create_session(session)
+        if self._active_cache is not None:
+            self._active_cache[session.session_id] = session
+        self._record_progress(session.session_id, time.monotonic_ns())
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Session started: %s - %s on %s",
+                event.user_name,
+                event.item_name,
+                event.device_name,
+            )
+
+    def _build_session(
+        self, event: PlaybackEvent, position_seconds: int, is_paused: bool, now: datetime
+    ) -> Session:
+        """Build a new active Session row from a playback event."""
+        return Session(
             session_id=uuid.uuid4().hex,
             jellyfin_session_id=event.session_id,
             user_id=event.user_id,
@@ -264,10 +675,7 @@ class JellyfinWebSocketClient:
             last_position_seconds=position_seconds,
             last_state_is_paused=is_paused,
             last_progress_update=now,
-        )
-        await db.create_session(session)
-        logger.info(
-            f"Session started: {event.user_name} - {event.item_name} on {event.device_name}"
+            last_progress_epoch=int(now.timestamp()),
         )
 
     def _calculate_deltas(
@@ -276,27 +684,28 @@ class JellyfinWebSocketClient:
         position_seconds: int,
         is_paused: bool,
         now: datetime,
+        now_monotonic_ns: Optional[int] = None,
     ) -> tuple[int, int]:
         """Calculate play and pause duration deltas.
 
         Uses position-based calculation for play time (more accurate for media consumption)
-        and time-based calculation for pause time.
+        and time-based calculation for pause time. Elapsed time comes from the monotonic
+        clock when the session carries a stamp, falling back to integer epoch seconds for
+        sessions this process has not written yet.
         """
-        elapsed = max(0, int((now - existing.last_progress_update).total_seconds()))
-        # Cap elapsed to avoid huge jumps from stale data
-        elapsed = min(elapsed, 300)
-
-        # Pause time: if was paused, add elapsed time
-        paused_add = elapsed if existing.last_state_is_paused else 0
-
-        # Play time: use position delta (more accurate than elapsed time)
-        play_add = 0
-        if not existing.last_state_is_paused:
-            play_add = max(0, position_seconds - existing.last_position_seconds)
-            # Cap play_add to avoid huge jumps from seeking
-            play_add = min(play_add, elapsed + 10)  # Allow small tolerance
-
-        return play_add, paused_add
+        if now_monotonic_ns is not None and existing.last_progress_monotonic_ns is not None:
+            elapsed = (now_monotonic_ns - existing.last_progress_monotonic_ns) // 1_000_000_000
+        else:
+            last_epoch = existing.last_progress_epoch
+            if last_epoch is None:
+                last_epoch = int(existing.last_progress_update.timestamp())
+            elapsed = int(now.timestamp()) - last_epoch
+        return _calc_deltas(
+            elapsed,
+            existing.last_position_seconds,
+            position_seconds,
+            existing.last_state_is_paused,
+        )
 
     async def _finalize_session(
         self,
@@ -304,38 +713,58 @@ class JellyfinWebSocketClient:
         now: datetime,
         position_seconds: Optional[int] = None,
         is_paused: Optional[bool] = None,
+        now_monotonic_ns: Optional[int] = None,
     ) -> None:
+        await db.update_session_state(
+            *self._finalize_update(existing, now, position_seconds, is_paused, now_monotonic_ns)
+        )
+
+    def _finalize_update(
+        self,
+        existing: Session,
+        now: datetime,
+        position_seconds: Optional[int] = None,
+        is_paused: Optional[bool] = None,
+        now_monotonic_ns: Optional[int] = None,
+    ) -> SessionStateUpdate:
+        """Build the final state update for a session that is about to end."""
         position = (
             position_seconds if position_seconds is not None else existing.last_position_seconds
         )
         paused = is_paused if is_paused is not None else existing.last_state_is_paused
-        play_add, paused_add = self._calculate_deltas(existing, position, paused, now)
-        await db.update_session_state(
-            existing.session_id, position, paused, play_add, paused_add, now
+        play_add, paused_add = self._calculate_deltas(
+            existing, position, paused, now, now_monotonic_ns
         )
+        return existing.session_id, position, paused, play_add, paused_add, now
+
+    def _http_client(self) -> httpx.AsyncClient:
+        """Return the shared HTTP client, creating it on first use."""
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(max_keepalive_connections=4, keepalive_expiry=60.0),
+            )
+        return self._http
 
     async def _refresh_sessions(self) -> None:
         """Refresh session list via REST to catch up after reconnect."""
         url = f"{settings.jellyfin_url}/Sessions"
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                url,
-                params={"api_key": settings.jellyfin_api_key},
-                timeout=10.0,
-            )
+        response = await self._http_client().get(
+            url,
+            params={"api_key": settings.jellyfin_api_key},
+            timeout=10.0,
+        )
         if response.status_code != 200:
             logger.warning(f"Failed to refresh sessions: {response.status_code}")
             return
-        sessions = response.json()
+        sessions = orjson.loads(response.content)
         await self._handle_sessions(sessions)
 
     def status(self) -> dict:
         """Expose client status for health/metrics."""
         return {
             "connected": self._connected,
-            "last_message_at": (
-                self._last_message_at.isoformat() if self._last_message_at else None
-            ),
+            "last_message_at": self._last_message_at_iso,
         }
 
 
@@ -3,6 +3,7 @@ import asyncio
 import logging
 import signal
 import sys
+from typing import Any, Callable, Coroutine, Optional, TypeVar
 
 import uvicorn
 
@@ -16,6 +17,12 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+
+class _ShutdownSignal(Exception):
+    """Raised inside the server task group to unwind it on shutdown."""
+
 
 class JellytrackServer:
     def __init__(self):
@@ -29,48 +36,40 @@ class JellytrackServer:
         await db.connect()
         logger.info(f"Connected to database: {settings.database_path}")
 
-        # Setup signal handlers
-        loop = asyncio.get_event_loop()
+        # Setup signal handlers; Event.set is a plain callable, so no task is needed
+        loop = asyncio.get_running_loop()
         for sig in (signal.SIGTERM, signal.SIGINT):
-            loop.add_signal_handler(sig, lambda s=sig: asyncio.create_task(self.shutdown()))
-
-        # Start WebSocket client and web server
-        ws_task = asyncio.create_task(self._run_websocket_client())
-        web_task = asyncio.create_task(self._run_web_server())
-        agg_task = asyncio.create_task(self._run_aggregator())
-
-        logger.info(f"Dashboard available at http://localhost:{settings.dashboard_port}")
-
-        # Wait for shutdown
-        await self._shutdown_event.wait()
-
-        # Cancel tasks
-        ws_task.cancel()
-        web_task.cancel()
-        agg_task.cancel()
+            loop.add_signal_handler(sig, self._shutdown_event.set)
 
+        # Run WebSocket client, web server and aggregator until shutdown; raising
+        # the sentinel makes the task group cancel all three concurrently
         try:
-            await ws_task
-        except asyncio.CancelledError:
-            pass
+            async with asyncio.TaskGroup() as tg:
+                tg.create_task(self._run_websocket_client())
+                tg.create_task(self._run_web_server())
+                tg.create_task(self._run_aggregator())
 
-        try:
-            await web_task
-        except asyncio.CancelledError:
-            pass
-        try:
-            await agg_task
-        except asyncio.CancelledError:
-            pass
+                logger.info(f"Dashboard available at http://localhost:{settings.dashboard_port}")
 
-        # Cleanup
-        await jellyfin_client.stop()
-        await db.close()
-        logger.info("Jellytrack stopped")
+                await self._shutdown_event.wait()
+                logger.info("Shutting down...")
+                raise _ShutdownSignal()
+        except* _ShutdownSignal:
+            pass
+        except* Exception as group:
+            # A crashed task tears the group down; log it and still shut down cleanly
+            for exc in group.exceptions:
+                logger.error(f"Server task failed: {exc!r}")
+        finally:
+            # Cleanup; stop() writes pending session progress, so it runs before close()
+            try:
+                await jellyfin_client.stop()
+            finally:
+                await db.close()
+            logger.info("Jellytrack stopped")
 
     async def shutdown(self) -> None:
         """Signal shutdown."""
-        logger.info("Shutting down...")
         self._shutdown_event.set()
 
     async def _run_websocket_client(self) -> None:
@@ -86,11 +85,16 @@ class JellytrackServer:
         """Run the FastAPI web server."""
         from dashboard.app import app
 
+        # serve() runs on the current loop, which _loop_factory already chose; uvicorn's
+        # own loop= option only applies to Server.run(), so it is left unset
         config = uvicorn.Config(
             app,
             host="0.0.0.0",
             port=settings.dashboard_port,
             log_level="info",
+            http="httptools",
+            access_log=False,
+            server_header=False,
         )
         server = uvicorn.Server(config)
         try:
@@ -106,11 +110,30 @@ class JellytrackServer:
                     pruned = await db.aggregate_and_prune(settings.retention_days)
                     if pruned > 0:
                         logger.info(f"Aggregated and pruned {pruned} sessions")
+                await db.optimize()
             except Exception as e:
                 logger.error(f"Aggregation error: {e}")
             await asyncio.sleep(settings.aggregation_interval_hours * 3600)
 
 
+def _loop_factory() -> Optional[Callable[[], asyncio.AbstractEventLoop]]:
+    """Return uvloop's loop factory when enabled and installed, else the default."""
+    if not settings.use_uvloop:
+        return None
+    try:
+        import uvloop
+    except ImportError:
+        logger.warning("uvloop is not installed, using the default asyncio event loop")
+        return None
+    return uvloop.new_event_loop
+
+
+def _run(coro: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine to completion on a fresh event loop."""
+    with asyncio.Runner(loop_factory=_loop_factory()) as runner:
+        return runner.run(coro)
+
+
 def main() -> None:
     """Main entry point."""
     parser = argparse.ArgumentParser(description="Jellytrack - Jellyfin Playback Tracker")
@@ -136,11 +159,11 @@ def main() -> None:
     if args.command == "import":
         from .importer import run_import
 
-        count = asyncio.run(run_import(days=args.days))
+        count = _run(run_import(days=args.days))
         logger.info(f"Imported {count} sessions")
     else:
         server = JellytrackServer()
-        asyncio.run(server.start())
+        _run(server.start())
 
 
 if __name__ == "__main__":
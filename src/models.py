@@ -1,10 +1,14 @@
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional
 
 from pydantic import BaseModel
 
 
-class Session(BaseModel):
+@dataclass(slots=True, kw_only=True, eq=False)
+class Session:
+    """A playback session as stored in the sessions table."""
+
     id: Optional[int] = None
     session_id: str
     jellyfin_session_id: Optional[str] = None
@@ -27,9 +31,14 @@ class Session(BaseModel):
     last_position_seconds: int = 0
     last_state_is_paused: bool = False
     last_progress_update: datetime
+    # last_progress_update as integer epoch seconds, filled when the row is loaded
+    last_progress_epoch: Optional[int] = None
+    # In-process time.monotonic_ns() stamp of last_progress_update; never persisted
+    last_progress_monotonic_ns: Optional[int] = None
 
 
-class PlaybackEvent(BaseModel):
+@dataclass(slots=True, kw_only=True, eq=False)
+class PlaybackEvent:
     """Model for Jellyfin playback events."""
 
     session_id: str
@@ -48,6 +57,11 @@ class PlaybackEvent(BaseModel):
     is_paused: bool = False
 
 
+# The stat models below are built with model_construct() from our own SQL rows,
+# which skips validation; they stay pydantic so the JSON routes can serialize them
+# through their response_model.
+
+
 class UserWatchtime(BaseModel):
     """Aggregated watchtime per user."""
 
@@ -1,3 +1,5 @@
+import sqlite3
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta, timezone
 
 import pytest
@@ -81,6 +83,16 @@ async def test_timeout_stale_sessions(db):
     assert fetched.ended_at is not None
 
 
+@pytest.mark.asyncio
+async def test_timeout_session(db):
+    session = _build_session("session-timeout", datetime.now(), is_active=True)
+    await db.create_session(session)
+
+    assert await db.timeout_session("session-timeout") is True
+    assert await db.timeout_session("session-timeout") is False
+    assert await db.get_active_session("session-timeout") is None
+
+
 @pytest.mark.asyncio
 async def test_aggregate_and_prune(db):
     old = datetime.now() - timedelta(days=2)
@@ -117,6 +129,53 @@ async def test_aggregate_and_prune(db):
     assert row["play_seconds"] == 600
 
 
+@pytest.mark.asyncio
+async def test_summary_stats_combines_sessions_and_aggregates(db, monkeypatch):
+    monkeypatch.setattr("src.database.settings.retention_days", 1)
+    old = datetime.now() - timedelta(days=2)
+    await db.create_session(
+        _build_session("session-a", old, is_active=False, play_duration_seconds=300)
+    )
+    await db.aggregate_and_prune(retention_days=1)
+    await db.create_session(_build_session("session-b", datetime.now(), play_duration_seconds=60))
+
+    summary = await db.get_summary_stats(days=30)
+
+    assert summary == {
+        "total_sessions": 2,
+        "unique_users": 1,
+        "unique_media": 1,
+        "total_seconds": 360,
+    }
+
+
+@pytest.mark.asyncio
+async def test_aggregate_and_prune_in_batches(db, monkeypatch):
+    monkeypatch.setattr("src.database._PRUNE_BATCH_SIZE", 2)
+    old = datetime.now() - timedelta(days=2)
+    await db.bulk_create_sessions(
+        [
+            _build_session(f"session-{i}", old, is_active=False, play_duration_seconds=100)
+            for i in range(5)
+        ]
+    )
+    await db.create_session(_build_session("session-live", old, is_active=True))
+
+    pruned = await db.aggregate_and_prune(retention_days=1)
+    assert pruned == 5
+
+    cursor = await db.conn.execute("SELECT session_id FROM sessions")
+    assert [row["session_id"] for row in await cursor.fetchall()] == ["session-live"]
+    cursor = await db.conn.execute(
+        "SELECT COUNT(*) as groups, SUM(session_count) as total_sessions, "
+        "SUM(play_seconds) as play_seconds FROM session_aggregates"
+    )
+    row = await cursor.fetchone()
+    assert row["groups"] == 1
+    assert row["total_sessions"] == 5
+    assert row["play_seconds"] == 500
+
+
 @pytest.mark.asyncio
 async def test_aggregate_and_prune_empty(db):
     pruned = await db.aggregate_and_prune(retention_days=0)
@@ -132,3 +191,192 @@ async def test_timezone_aware_roundtrip(db):
     fetched = await db.get_session_by_id("session-tz")
     assert fetched is not None
     assert fetched.started_at.tzinfo is not None
+
+
+@pytest.mark.asyncio
+async def test_is_active_stored_as_integer(db):
+    session = _build_session("session-int", datetime.now())
+    await db.create_session(session)
+    await db.end_session("session-int")
+
+    cursor = await db.conn.execute(
+        "SELECT is_active, typeof(is_active) as kind FROM sessions WHERE session_id = ?",
+        ("session-int",),
+    )
+    row = await cursor.fetchone()
+    assert row["is_active"] == 0
+    assert row["kind"] == "integer"
+
+
+@pytest.mark.asyncio
+async def test_reads_use_read_only_pool(db):
+    await db.create_session(_build_session("session-ro", datetime.now()))
+
+    async with db.read() as conn:
+        assert conn is not db.conn
+        cursor = await conn.execute("SELECT COUNT(*) as count FROM sessions")
+        row = await cursor.fetchone()
+        assert row["count"] == 1
+        with pytest.raises(sqlite3.OperationalError):
+            await conn.execute("DELETE FROM sessions")
+
+
+@pytest.mark.asyncio
+async def test_hourly_stats_groups_by_hour_of_day(db):
+    started_at = (datetime.now() - timedelta(days=1)).replace(hour=21, minute=15)
+    await db.create_session(
+        _build_session("session-hour", started_at, is_active=False, play_duration_seconds=120)
+    )
+
+    hourly = await db.get_hourly_stats(days=7)
+    assert [(h.hour, h.session_count, h.total_seconds) for h in hourly] == [(21, 1, 120)]
+
+
+@pytest.mark.asyncio
+async def test_bulk_session_writes(db):
+    now = datetime.now()
+    await db.bulk_create_sessions(
+        [_build_session("session-1", now), _build_session("session-2", now)]
+    )
+    await db.bulk_update_session_state(
+        [("session-1", 30, False, 30, 0, now), ("session-2", 5, True, 0, 5, now)]
+    )
+    await db.bulk_end_sessions(["session-2"])
+
+    active = await db.get_active_sessions(exclude_users=False)
+    assert [s.session_id for s in active] == ["session-1"]
+    assert active[0].play_duration_seconds == 30
+    assert active[0].last_position_seconds == 30
+
+
+@pytest.mark.asyncio
+async def test_optimize_populates_planner_statistics(db):
+    now = datetime.now()
+    await db.bulk_create_sessions(
+        [_build_session(f"session-{i}", now, is_active=i == 0) for i in range(50)]
+    )
+    await db.optimize()
+
+    cursor = await db.conn.execute("SELECT idx, stat FROM sqlite_stat1 WHERE tbl = 'sessions'")
+    stats = {row["idx"]: row["stat"] for row in await cursor.fetchall()}
+    assert stats["idx_sessions_stats"].startswith("50 ")
+    assert "idx_sessions_active_started" in stats
+
+
+@pytest.mark.asyncio
+async def test_connections_are_tuned(db):
+    cursor = await db.conn.execute("PRAGMA synchronous")
+    assert (await cursor.fetchone())[0] == 1  # NORMAL
+    async with db.read() as conn:
+        cursor = await conn.execute("PRAGMA busy_timeout")
+        assert (await cursor.fetchone())[0] == 5000
+
+
+@pytest.mark.asyncio
+async def test_connect_upgrades_old_schema(tmp_path):
+    path = tmp_path / "old.db"
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE sessions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_id TEXT UNIQUE,
+            jellyfin_session_id TEXT,
+            user_id TEXT,
+            user_name TEXT,
+            device_id TEXT,
+            device_name TEXT,
+            client_name TEXT,
+            media_id TEXT,
+            media_title TEXT,
+            media_type TEXT,
+            series_name TEXT,
+            season_number INTEGER,
+            episode_number INTEGER,
+            started_at TIMESTAMP,
+            ended_at TIMESTAMP,
+            play_duration_seconds INTEGER DEFAULT 0,
+            is_active BOOLEAN DEFAULT TRUE,
+            last_progress_update TIMESTAMP
+        )
+    """)
+    conn.execute(
+        "INSERT INTO sessions (session_id, user_name, started_at, play_duration_seconds) "
+        "VALUES ('old-1', 'Test User', ?, 120)",
+        (datetime.now().isoformat(),),
+    )
+    conn.commit()
+    conn.close()
+
+    database = Database(path)
+    try:
+        await database.connect()
+        stats = await database.get_daily_stats(days=30)
+        assert [row["total_seconds"] for row in stats] == [120]
+        cursor = await database.conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND name = 'idx_sessions_stats'"
+        )
+        assert await cursor.fetchone() is not None
+    finally:
+        await database.close()
+
+
+class _PlanRecorder:
+    """Read connection stand-in that records the query plan of every statement."""
+
+    def __init__(self, conn):
+        self._conn = conn
+        self.plans: list[str] = []
+
+    async def execute(self, sql, params=()):
+        cursor = await self._conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        self.plans.append(" ".join(row["detail"] for row in await cursor.fetchall()))
+        return await self._conn.execute(sql, params)
+
+
+def _record_plans(db, monkeypatch) -> list[_PlanRecorder]:
+    """Route db.read() through plan recorders and return them."""
+    read = db.read
+    recorders: list[_PlanRecorder] = []
+
+    @asynccontextmanager
+    async def _recording_read():
+        async with read() as conn:
+            recorders.append(_PlanRecorder(conn))
+            yield recorders[-1]
+
+    monkeypatch.setattr(db, "read", _recording_read)
+    return recorders
+
+
+@pytest.mark.asyncio
+async def test_active_session_queries_use_partial_index(db, monkeypatch):
+    monkeypatch.setattr("src.database.settings.excluded_user_names", "admin")
+    recorders = _record_plans(db, monkeypatch)
+
+    await db.get_active_sessions()
+    await db.get_active_sessions(exclude_users=False)
+    await db.get_active_sessions_light()
+
+    plans = [plan for recorder in recorders for plan in recorder.plans]
+    assert len(plans) == 3
+    for plan in plans:
+        assert "USING INDEX idx_sessions_active_started" in plan, plan
+        assert "TEMP B-TREE" not in plan, plan
+
+
+@pytest.mark.asyncio
+async def test_stats_queries_use_covering_index(db, monkeypatch):
+    monkeypatch.setattr("src.database.settings.excluded_user_names", "admin")
+    monkeypatch.setattr("src.database.settings.retention_days", 180)
+    recorders = _record_plans(db, monkeypatch)
+
+    await db.get_daily_stats(days=30)
+    await db.get_device_stats(days=30, media_type="Movie")
+    await db.get_pause_ratio_by_device(days=30)
+    await db.get_hourly_weekday_heatmap(days=30)
+    await db.get_series_daily_totals(days=30)
+
+    plans = [plan for recorder in recorders for plan in recorder.plans]
+    assert len(plans) == 5
+    for plan in plans:
+        assert "USING COVERING INDEX idx_sessions_stats" in plan, plan
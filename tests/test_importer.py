@@ -1,5 +1,9 @@
+import asyncio
+import json
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 
+import httpx
 import pytest
 import pytest_asyncio
 
@@ -16,24 +20,34 @@ class _FakeResponse:
     def json(self):
         return self._payload
 
+    async def aiter_bytes(self):
+        body = json.dumps(self._payload).encode("utf-8")
+        # Split the body to exercise incremental parsing across chunks
+        for start in range(0, len(body), 64):
+            yield body[start : start + 64]
+
 
 class _FakeAsyncClient:
-    def __init__(self, post_response: _FakeResponse, get_response: _FakeResponse):
+    def __init__(self, post_response: _FakeResponse | Exception, get_response: _FakeResponse):
         self._post_response = post_response
         self._get_response = get_response
-
-    async def __aenter__(self):
-        return self
-
-    async def __aexit__(self, exc_type, exc, tb):
-        return False
-
-    async def post(self, *_args, **_kwargs):
-        return self._post_response
-
-    async def get(self, *_args, **_kwargs):
+        self.closed = False
+        self.params = []
+
+    @asynccontextmanager
+    async def stream(self, *_args, **kwargs):
+        self.params.append(kwargs.get("params"))
+        if isinstance(self._post_response, Exception):
+            raise self._post_response
+        yield self._post_response
+
+    async def get(self, *_args, **kwargs):
+        self.params.append(kwargs.get("params"))
         return self._get_response
 
+    async def aclose(self):
+        self.closed = True
+
 
 @pytest_asyncio.fixture
 async def db(tmp_path):
@@ -100,8 +114,12 @@ async def test_importer_parses_dates_and_series(monkeypatch, db):
     post_response = _FakeResponse(200, {"columns": columns, "results": results})
     get_response = _FakeResponse(200, [{"Id": "user-1", "Name": "Alice"}])
 
-    def _fake_async_client():
-        return _FakeAsyncClient(post_response, get_response)
+    clients = []
+
+    def _fake_async_client(**kwargs):
+        assert kwargs["base_url"] == "http://example.test"
+        clients.append(_FakeAsyncClient(post_response, get_response))
+        return clients[-1]
 
     monkeypatch.setattr(importer_module, "db", db)
     monkeypatch.setattr(importer_module.httpx, "AsyncClient", _fake_async_client)
@@ -123,3 +141,90 @@ async def test_importer_parses_dates_and_series(monkeypatch, db):
     session_aware = await db.get_session_by_id("imported_1")
     assert session_aware.started_at.tzinfo is not None
     assert session_aware.started_at == datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+
+    # Re-running the import skips rows that are already stored
+    assert await importer.import_all(days=7) == 0
+
+    # Both imports share one client until the importer is closed
+    await importer.aclose()
+    assert len(clients) == 1
+    assert clients[0].closed
+    assert clients[0].params == [{"api_key": "key"}] * 4
+
+
+@pytest.mark.asyncio
+async def test_importer_retries_failed_batch_row_by_row(monkeypatch, db):
+    columns = ["rowid", "DateCreated", "UserId", "ItemId", "ItemType", "ItemName", "PlayDuration"]
+    results = [
+        [rowid, "2024-01-02 03:04:05", "user-1", f"item-{rowid}", "Movie", "Movie", 60]
+        for rowid in (1, 2, 3)
+    ]
+    post_response = _FakeResponse(200, {"columns": columns, "results": results})
+    get_response = _FakeResponse(200, [])
+
+    bulk_create_sessions = db.bulk_create_sessions
+
+    async def _reject_row_two(sessions, skip_existing=False):
+        if any(s.session_id == "imported_2" for s in sessions):
+            raise ValueError("bad row")
+        return await bulk_create_sessions(sessions, skip_existing=skip_existing)
+
+    monkeypatch.setattr(db, "bulk_create_sessions", _reject_row_two)
+    monkeypatch.setattr(importer_module, "db", db)
+    monkeypatch.setattr(
+        importer_module.httpx,
+        "AsyncClient",
+        lambda **_kwargs: _FakeAsyncClient(post_response, get_response),
+    )
+
+    importer = PlaybackReportingImporter()
+    assert await importer.import_all(days=7) == 2
+    await importer.aclose()
+
+    assert await db.get_session_by_id("imported_1") is not None
+    assert await db.get_session_by_id("imported_2") is None
+    assert await db.get_session_by_id("imported_3") is not None
+
+
+class _HangingUsersClient(_FakeAsyncClient):
+    def __init__(self, post_response: _FakeResponse | Exception):
+        super().__init__(post_response, _FakeResponse(200, []))
+        self.users_cancelled = False
+
+    @asynccontextmanager
+    async def stream(self, *args, **kwargs):
+        # Yield like real network I/O so the /Users request is in flight
+        await asyncio.sleep(0)
+        async with super().stream(*args, **kwargs) as response:
+            yield response
+
+    async def get(self, *_args, **_kwargs):
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            self.users_cancelled = True
+            raise
+
+
+@pytest.mark.asyncio
+async def test_importer_failed_query_does_not_wait_for_users(monkeypatch, db):
+    client = _HangingUsersClient(_FakeResponse(500, {}))
+    monkeypatch.setattr(importer_module, "db", db)
+    monkeypatch.setattr(importer_module.httpx, "AsyncClient", lambda **_kwargs: client)
+
+    importer = PlaybackReportingImporter()
+    async with asyncio.timeout(1):
+        assert await importer.import_all(days=7) == 0
+    assert client.users_cancelled
+
+
+@pytest.mark.asyncio
+async def test_importer_query_error_keeps_its_type(monkeypatch, db):
+    client = _HangingUsersClient(httpx.ConnectError("refused"))
+    monkeypatch.setattr(importer_module, "db", db)
+    monkeypatch.setattr(importer_module.httpx, "AsyncClient", lambda **_kwargs: client)
+
+    importer = PlaybackReportingImporter()
+    with pytest.raises(httpx.ConnectError):
+        await importer.import_all(days=7)
+    assert client.users_cancelled
@@ -1,4 +1,7 @@
+import asyncio
+import dataclasses
 import json
+import time
 from datetime import datetime, timedelta
 
 import pytest
@@ -40,6 +43,8 @@ class _DummyDB:
         self.updated = []
         self.ended = []
         self.created = []
+        self.timed_out = []
+        self.active_loads = 0
 
     async def get_active_session_by_jellyfin_id(self, session_id: str) -> Session | None:
         if self.existing and self.existing.jellyfin_session_id == session_id:
@@ -51,8 +56,9 @@ class _DummyDB:
             return self.existing
         return None
 
-    async def get_active_sessions(self):
-        return []
+    async def get_active_sessions(self, *_args, **_kwargs):
+        self.active_loads += 1
+        return [self.existing] if self.existing else []
 
     async def update_session_state(
         self,
@@ -79,6 +85,23 @@ class _DummyDB:
     async def create_session(self, session: Session) -> None:
         self.created.append(session)
 
+    async def timeout_stale_sessions(self, _timeout_minutes: int) -> int:
+        return 0
+
+    async def timeout_session(self, session_id: str) -> bool:
+        self.timed_out.append(session_id)
+        return True
+
+    async def bulk_update_session_state(self, updates) -> None:
+        for update in updates:
+            await self.update_session_state(*update)
+
+    async def bulk_end_sessions(self, session_ids: list[str]) -> None:
+        self.ended.extend(session_ids)
+
+    async def bulk_create_sessions(self, sessions: list[Session]) -> None:
+        self.created.extend(sessions)
+
 
 def test_calculate_deltas_was_paused():
     """When previously paused, elapsed time counts as pause duration."""
@@ -154,6 +177,7 @@ async def test_handle_sessions_allows_null_position_ticks(monkeypatch):
     ]
 
     await client._handle_sessions(sessions)
+    await client._flush_dirty()
 
     assert len(dummy_db.updated) == 1
     assert dummy_db.updated[0]["position_seconds"] == 0
@@ -200,3 +224,360 @@ async def test_playback_stopped_handles_null_position_ticks(monkeypatch):
     await client._handle_message(json.dumps(message))
 
     assert dummy_db.ended == ["session-1"]
+
+
+@pytest.mark.asyncio
+async def test_handle_sessions_ends_sessions_missing_from_payload(monkeypatch):
+    client = JellyfinWebSocketClient()
+    existing = _build_session(
+        datetime.now() - timedelta(seconds=5), last_position=10, last_paused=False
+    )
+    dummy_db = _DummyDB(existing=existing)
+    monkeypatch.setattr(jellyfin_client_module, "db", dummy_db)
+
+    await client._handle_sessions([])
+
+    assert dummy_db.ended == ["session-1"]
+    assert dummy_db.created == []
+
+
+@pytest.mark.asyncio
+async def test_handle_sessions_media_change_ends_then_creates(monkeypatch):
+    client = JellyfinWebSocketClient()
+    existing = _build_session(
+        datetime.now() - timedelta(seconds=5), last_position=10, last_paused=False
+    )
+    dummy_db = _DummyDB(existing=existing)
+    monkeypatch.setattr(jellyfin_client_module, "db", dummy_db)
+
+    sessions = [
+        {
+            "Id": "session-1",
+            "UserId": "user-1",
+            "UserName": "User",
+            "DeviceId": "device-1",
+            "DeviceName": "Device",
+            "Client": "Client",
+            "NowPlayingItem": {"Id": "media-2", "Name": "Next", "Type": "Movie"},
+            "PlayState": {"PositionTicks": 0, "IsPaused": False},
+        }
+    ]
+
+    await client._handle_sessions(sessions)
+
+    assert [u["session_id"] for u in dummy_db.updated] == ["session-1"]
+    assert dummy_db.ended == ["session-1"]
+    assert len(dummy_db.created) == 1
+    assert dummy_db.created[0].media_id == "media-2"
+
+
+@pytest.mark.asyncio
+async def test_session_update_callback_is_debounced():
+    client = JellyfinWebSocketClient()
+    client._notify_debounce_ms = 10
+    calls = {"count": 0}
+
+    async def _callback():
+        calls["count"] += 1
+
+    client.set_session_update_callback(_callback)
+    for _ in range(5):
+        client._schedule_notify()
+    await client._pending_notify
+
+    assert calls["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_check_timeouts_fires_expired_deadlines(monkeypatch):
+    client = JellyfinWebSocketClient()
+    dummy_db = _DummyDB()
+    monkeypatch.setattr(jellyfin_client_module, "db", dummy_db)
+
+    now = time.monotonic_ns()
+    hour_ns = 3600 * 1_000_000_000
+    client._track_timeout("stale", now - hour_ns)
+    client._track_timeout("fresh", now)
+    client._track_timeout("ended", now - hour_ns)
+    client._forget_session("ended")
+
+    task = asyncio.create_task(client._check_timeouts())
+    await asyncio.sleep(0.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert dummy_db.timed_out == ["stale"]
+    assert "fresh" in client._timeout_deadlines
+
+
+class _StatefulDB(_DummyDB):
+    """Applies state updates to a stored row and returns copies of it, like a database."""
+
+    async def get_active_sessions(self, *_args, **_kwargs):
+        self.active_loads += 1
+        return [dataclasses.replace(self.existing)]
+
+    async def update_session_state(self, session_id, position, paused, play_add, paused_add, now):
+        await super().update_session_state(session_id, position, paused, play_add, paused_add, now)
+        self.existing.play_duration_seconds += play_add
+        self.existing.paused_duration_seconds += paused_add
+        self.existing.last_position_seconds = position
+        self.existing.last_state_is_paused = paused
+        self.existing.last_progress_update = now
+
+    async def timeout_stale_sessions(self, _timeout_minutes: int) -> int:
+        # Some other session went stale, which invalidates the client's cache
+        return 1
+
+
+@pytest.mark.asyncio
+async def test_timeout_sweep_does_not_double_count_pending_progress(monkeypatch):
+    client = JellyfinWebSocketClient()
+    existing = _build_session(
+        datetime.now() - timedelta(seconds=30), last_position=0, last_paused=False
+    )
+    dummy_db = _StatefulDB(existing=existing)
+    monkeypatch.setattr(jellyfin_client_module, "db", dummy_db)
+
+    def _sessions(seconds: int) -> list[dict]:
+        return [
+            {
+                "Id": "session-1",
+                "NowPlayingItem": {"Id": "media-1", "Name": "Title", "Type": "Movie"},
+                "PlayState": {"PositionTicks": seconds * 10_000_000, "IsPaused": False},
+            }
+        ]
+
+    await client._handle_sessions(_sessions(15))
+    assert client._dirty
+
+    task = asyncio.create_task(client._check_timeouts())
+    await asyncio.sleep(0.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    # Fifteen more seconds of playback before the next tick
+    existing.last_progress_update -= timedelta(seconds=15)
+    await client._handle_sessions(_sessions(30))
+    await client._flush_dirty()
+
+    assert existing.play_duration_seconds == 30
+    assert existing.last_position_seconds == 30
+
+
+class _FailingFlushDB(_DummyDB):
+    def __init__(self, client: JellyfinWebSocketClient):
+        super().__init__()
+        self.client = client
+
+    async def bulk_update_session_state(self, updates) -> None:
+        # A newer update lands while the failing write is in flight
+        self.client._mark_dirty(("session-1", 90, True, 5, 3, datetime(2024, 1, 1, 12, 1)))
+        raise RuntimeError("database is locked")
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_newer_state(monkeypatch):
+    client = JellyfinWebSocketClient()
+    monkeypatch.setattr(jellyfin_client_module, "db", _FailingFlushDB(client))
+    client._mark_dirty(("session-1", 60, False, 10, 0, datetime(2024, 1, 1, 12, 0)))
+
+    with pytest.raises(RuntimeError):
+        await client._flush_dirty()
+
+    # Newer position, pause state and timestamp survive; both deltas are kept
+    assert client._dirty["session-1"] == (
+        "session-1",
+        90,
+        True,
+        15,
+        3,
+        datetime(2024, 1, 1, 12, 1),
+    )
+
+
+def test_calculate_deltas_prefers_monotonic_clock():
+    """Elapsed time uses the monotonic stamp, ignoring wall-clock jumps."""
+    client = JellyfinWebSocketClient()
+    last_update = datetime.now()
+    existing = _build_session(last_update, last_position=50, last_paused=True)
+    existing.last_progress_monotonic_ns = 100 * 1_000_000_000
+    # Wall clock jumped back an hour, monotonic advanced 10s
+    now = last_update - timedelta(hours=1)
+
+    play_add, paused_add = client._calculate_deltas(
+        existing, position_seconds=50, is_paused=True, now=now, now_monotonic_ns=110 * 1_000_000_000
+    )
+
+    assert paused_add == 10
+    assert play_add == 0
+
+
+@pytest.mark.asyncio
+async def test_handle_sessions_skips_unchanged_sessions(monkeypatch):
+    client = JellyfinWebSocketClient()
+    existing = _build_session(
+        datetime.now() - timedelta(seconds=5), last_position=10, last_paused=True
+    )
+    dummy_db = _DummyDB(existing=existing)
+    monkeypatch.setattr(jellyfin_client_module, "db", dummy_db)
+
+    sessions = [
+        {
+            "Id": "session-1",
+            "NowPlayingItem": {"Id": "media-1", "Name": "Title", "Type": "Movie"},
+            "PlayState": {"PositionTicks": 100_000_000, "IsPaused": True},
+        }
+    ]
+
+    await client._handle_sessions(sessions)
+    await client._flush_dirty()
+    await client._handle_sessions(sessions)
+    await client._flush_dirty()
+    assert len(dummy_db.updated) == 1
+
+    # Past the forced-write interval the unchanged session is written again
+    existing.last_progress_monotonic_ns -= jellyfin_client_module._FORCED_WRITE_NS
+    await client._handle_sessions(sessions)
+    await client._flush_dirty()
+    assert len(dummy_db.updated) == 2
+    assert dummy_db.updated[1]["paused_add_seconds"] >= 60
+
+
+@pytest.mark.asyncio
+async def test_handle_sessions_reuses_active_session_cache(monkeypatch):
+    client = JellyfinWebSocketClient()
+    existing = _build_session(
+        datetime.now() - timedelta(seconds=5), last_position=10, last_paused=False
+    )
+    dummy_db = _DummyDB(existing=existing)
+    monkeypatch.setattr(jellyfin_client_module, "db", dummy_db)
+
+    def _sessions(ticks: int) -> list[dict]:
+        return [
+            {
+                "Id": "session-1",
+                "NowPlayingItem": {"Id": "media-1", "Name": "Title", "Type": "Movie"},
+                "PlayState": {"PositionTicks": ticks, "IsPaused": False},
+            }
+        ]
+
+    await client._handle_sessions(_sessions(150_000_000))
+    await client._handle_sessions(_sessions(200_000_000))
+
+    assert dummy_db.active_loads == 1
+    assert existing.last_position_seconds == 20
+    # Plain progress is coalesced in memory until a flush or a state change
+    assert dummy_db.updated == []
+
+    await client._handle_sessions([])
+    assert dummy_db.ended == ["session-1"]
+    assert len(dummy_db.updated) == 1
+    assert dummy_db.updated[0]["play_add_seconds"] == 10
+    assert client._active_cache == {}
+
+
+@pytest.mark.asyncio
+async def test_handle_sessions_flushes_pause_toggle_immediately(monkeypatch):
+    client = JellyfinWebSocketClient()
+    existing = _build_session(
+        datetime.now() - timedelta(seconds=5), last_position=10, last_paused=False
+    )
+    dummy_db = _DummyDB(existing=existing)
+    monkeypatch.setattr(jellyfin_client_module, "db", dummy_db)
+
+    sessions = [
+        {
+            "Id": "session-1",
+            "NowPlayingItem": {"Id": "media-1", "Name": "Title", "Type": "Movie"},
+            "PlayState": {"PositionTicks": 150_000_000, "IsPaused": True},
+        }
+    ]
+    await client._handle_sessions(sessions)
+
+    assert len(dummy_db.updated) == 1
+    assert dummy_db.updated[0]["is_paused"] is True
+    assert client._dirty == {}
+
+
+class _FakeWebSocket:
+    def __init__(self, frames: list[bytes]):
+        self.frames = list(frames)
+
+    async def recv(self, decode=None):
+        if self.frames:
+            return self.frames.pop(0)
+        await asyncio.Event().wait()
+
+
+@pytest.mark.asyncio
+async def test_recv_batch_drains_buffered_frames():
+    client = JellyfinWebSocketClient()
+    ws = _FakeWebSocket([b"1", b"2", b"3"])
+
+    frames = await client._recv_batch(ws)
+
+    assert frames == [b"1", b"2", b"3"]
+
+
+@pytest.mark.asyncio
+async def test_handle_messages_keeps_only_latest_sessions_snapshot(monkeypatch):
+    client = JellyfinWebSocketClient()
+    handled = []
+
+    async def _fake_handle_sessions(sessions):
+        handled.append(("Sessions", sessions))
+
+    async def _fake_handle_playback_stop(data):
+        handled.append(("PlaybackStopped", data))
+
+    monkeypatch.setattr(client, "_handle_sessions", _fake_handle_sessions)
+    monkeypatch.setattr(client, "_handle_playback_stop", _fake_handle_playback_stop)
+
+    frames = [
+        json.dumps({"MessageType": "Sessions", "Data": [1]}),
+        json.dumps({"MessageType": "PlaybackStopped", "Data": {"SessionId": "a"}}),
+        json.dumps({"MessageType": "Sessions", "Data": [2]}),
+        json.dumps({"MessageType": "Sessions", "Data": [3]}),
+    ]
+    await client._handle_messages(frames)
+
+    assert handled == [("PlaybackStopped", {"SessionId": "a"}), ("Sessions", [3])]
+
+
+@pytest.mark.asyncio
+async def test_handle_messages_skips_non_object_frames(monkeypatch):
+    client = JellyfinWebSocketClient()
+    handled = []
+
+    async def _fake_handle_playback_stop(data):
+        handled.append(data)
+
+    monkeypatch.setattr(client, "_handle_playback_stop", _fake_handle_playback_stop)
+
+    frames = [
+        json.dumps([1, 2]),
+        json.dumps("KeepAlive"),
+        json.dumps(42),
+        json.dumps({"MessageType": "PlaybackStopped", "Data": {"SessionId": "a"}}),
+    ]
+    await client._handle_messages(frames)
+
+    assert handled == [{"SessionId": "a"}]
+
+
+def test_calculate_deltas_uses_epoch_seconds_without_monotonic_stamp():
+    """Sessions loaded from the database fall back to integer epoch arithmetic."""
+    client = JellyfinWebSocketClient()
+    now = datetime.now()
+    existing = _build_session(now, last_position=50, last_paused=True)
+    existing.last_progress_epoch = int(now.timestamp()) - 7
+
+    play_add, paused_add = client._calculate_deltas(
+        existing, position_seconds=50, is_paused=True, now=now
+    )
+
+    assert paused_add == 7
+    assert play_add == 0
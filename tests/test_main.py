@@ -0,0 +1,42 @@
+import asyncio
+
+import pytest
+
+import src.main as main_module
+from src.main import JellytrackServer
+
+
+class _Recorder:
+    def __init__(self):
+        self.calls = []
+
+    async def connect(self):
+        self.calls.append("connect")
+
+    async def stop(self):
+        self.calls.append("stop")
+
+    async def close(self):
+        self.calls.append("close")
+
+
+@pytest.mark.asyncio
+async def test_start_cleans_up_when_a_task_crashes(monkeypatch):
+    recorder = _Recorder()
+    monkeypatch.setattr(main_module, "db", recorder)
+    monkeypatch.setattr(main_module, "jellyfin_client", recorder)
+    server = JellytrackServer()
+
+    async def _idle():
+        await asyncio.Event().wait()
+
+    async def _crash():
+        raise RuntimeError("bind failed")
+
+    monkeypatch.setattr(server, "_run_websocket_client", _idle)
+    monkeypatch.setattr(server, "_run_aggregator", _idle)
+    monkeypatch.setattr(server, "_run_web_server", _crash)
+
+    await server.start()
+
+    assert recorder.calls == ["connect", "stop", "close"]
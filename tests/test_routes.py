@@ -14,6 +14,9 @@ class _DummyDB:
     async def get_active_sessions(self, *_args, **_kwargs):
         return []
 
+    async def get_active_sessions_light(self, *_args, **_kwargs):
+        return []
+
     async def get_user_watchtime(self, *_args, **_kwargs):
         return []
 
@@ -225,3 +228,36 @@ def test_index_route_renders_metrics_charts(monkeypatch):
     assert "const heatmapMax = 10800" in body
     assert "data: [1, 1, 0, 1, 1, 1]" in body
     assert "Series A" in body
+
+
+class _DummyDBActive(_DummyDB):
+    async def get_active_sessions_light(self, *_args, **_kwargs):
+        return [
+            {
+                "session_id": "s1",
+                "user_name": "Alice",
+                "device_name": "Living Room TV",
+                "client_name": "Web",
+                "media_title": "Pilot",
+                "series_name": "Series A",
+                "season_number": 1,
+                "episode_number": 1,
+                "started_at": "2024-01-01T10:00:00",
+                "play_duration_seconds": 600,
+                "paused_duration_seconds": 60,
+                "last_state_is_paused": True,
+            }
+        ]
+
+
+def test_active_sessions_route_renders_light_rows(monkeypatch):
+    monkeypatch.setattr(routes_module, "db", _DummyDBActive())
+    monkeypatch.setattr(routes_module, "jellyfin_client", _DummyClient())
+
+    client = TestClient(app)
+    response = client.get("/api/sessions/active")
+    assert response.status_code == 200
+    body = response.text
+    assert "Alice" in body
+    assert "S1E1 - Pilot" in body
+    assert "Paused" in body